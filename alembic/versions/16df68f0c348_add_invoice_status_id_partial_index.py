@@ -0,0 +1,38 @@
+"""add_invoice_status_id_partial_index
+
+Revision ID: 16df68f0c348
+Revises: 2f2d9fd4ea57
+Create Date: 2026-10-16 14:02:55.204718
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '16df68f0c348'
+down_revision: Union[str, None] = '2f2d9fd4ea57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Invoice listing filtered by status and paginated by id (keyset cursor):
+    # the index order matches ORDER BY id, so a page is a bounded range scan.
+    # Unfiltered listings use the primary key; the per-school statement filters go
+    # through students (ix_students_school_id_active) since invoices have no
+    # school_id column.
+    # Used in: SELECT * FROM invoices WHERE deleted_at IS NULL AND status = ?
+    #          AND id > ? ORDER BY id LIMIT ?
+    # Built CONCURRENTLY (outside the migration transaction) to avoid blocking writes
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY ix_invoices_status_id_active
+            ON invoices (status, id)
+            WHERE deleted_at IS NULL
+        """)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY ix_invoices_status_id_active")
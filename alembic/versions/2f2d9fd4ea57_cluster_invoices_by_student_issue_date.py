@@ -0,0 +1,33 @@
+"""cluster_invoices_by_student_issue_date
+
+Revision ID: 2f2d9fd4ea57
+Revises: 463440c882ef
+Create Date: 2026-10-16 13:05:42.310985
+
+"""
+from typing import Sequence, Union
+
+# revision identifiers, used by Alembic.
+revision: str = '2f2d9fd4ea57'
+down_revision: Union[str, None] = '463440c882ef'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Intentionally a no-op (kept so databases stamped at this revision still
+    # resolve). It used to CLUSTER invoices by (student_id, issue_date), but that
+    # rewrites the heap in student order and destroys the issue_date correlation
+    # ix_invoices_issue_date_brin (8ca741b035c4) depends on: every block range
+    # would then span almost the whole date range, so the BRIN index could skip
+    # nothing and only add write cost.
+    #
+    # Invoices keep their natural, roughly issue_date-ordered layout. Per-student
+    # statements are served by ix_invoices_student_issue_date_active instead,
+    # whose INCLUDE columns make them Index Only Scans, so heap locality per
+    # student does not matter for them.
+    pass
+
+
+def downgrade() -> None:
+    pass
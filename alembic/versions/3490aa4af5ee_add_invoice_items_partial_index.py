@@ -0,0 +1,36 @@
+"""add_invoice_items_partial_index
+
+Revision ID: 3490aa4af5ee
+Revises: 8ca741b035c4
+Create Date: 2026-10-16 11:51:36.628014
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '3490aa4af5ee'
+down_revision: Union[str, None] = '8ca741b035c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # invoice_items had no index on invoice_id, so every total recalculation and
+    # item listing scanned the whole table. Only active items are ever read, and
+    # the INCLUDE columns let item rollups/listings use an Index Only Scan.
+    # Used in: SELECT SUM(total_amount) FROM invoice_items
+    #          WHERE invoice_id = ? AND deleted_at IS NULL
+    #          SELECT COUNT(*) FROM invoice_items
+    #          WHERE invoice_id = ? AND deleted_at IS NULL AND id != ?
+    op.execute("""
+        CREATE INDEX ix_invoice_items_invoice_id_active
+        ON invoice_items (invoice_id)
+        INCLUDE (description, quantity, unit_price, total_amount)
+        WHERE deleted_at IS NULL
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_invoice_items_invoice_id_active', table_name='invoice_items')
@@ -0,0 +1,51 @@
+"""replace_payment_deleted_at_with_flag
+
+Revision ID: 463440c882ef
+Revises: 9cc321139cc8
+Create Date: 2026-10-16 12:40:27.815336
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '463440c882ef'
+down_revision: Union[str, None] = '9cc321139cc8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Payments are only ever filtered on whether they are deleted, never on when,
+    # so the 8-byte timestamp becomes a 1-byte flag
+    op.add_column(
+        'payments',
+        sa.Column('is_deleted', sa.Boolean(), server_default=sa.false(), nullable=False),
+    )
+    op.execute("UPDATE payments SET is_deleted = true WHERE deleted_at IS NOT NULL")
+
+    # Used in: SELECT SUM(amount) FROM payments WHERE invoice_id = ? AND NOT is_deleted
+    op.drop_index('ix_payments_invoice_id_active', table_name='payments')
+    op.drop_column('payments', 'deleted_at')
+    op.execute("""
+        CREATE INDEX ix_payments_invoice_id_active
+        ON payments (invoice_id)
+        INCLUDE (amount)
+        WHERE NOT is_deleted
+    """)
+
+
+def downgrade() -> None:
+    op.add_column('payments', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE payments SET deleted_at = now() WHERE is_deleted")
+
+    op.drop_index('ix_payments_invoice_id_active', table_name='payments')
+    op.drop_column('payments', 'is_deleted')
+    op.execute("""
+        CREATE INDEX ix_payments_invoice_id_active
+        ON payments (invoice_id)
+        INCLUDE (amount)
+        WHERE deleted_at IS NULL
+    """)
@@ -0,0 +1,48 @@
+"""cover_payment_amount_in_partial_index
+
+Revision ID: 48f5d961507b
+Revises: e48c2c0b9fed
+Create Date: 2026-10-16 09:12:04.381920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '48f5d961507b'
+down_revision: Union[str, None] = 'e48c2c0b9fed'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Recreate the active payments index with amount as a non-key column so
+    # payment aggregations can be answered by an Index Only Scan (no heap fetches)
+    # Used in: SELECT SUM(amount) FROM payments WHERE invoice_id = ? AND deleted_at IS NULL
+    op.drop_index('ix_payments_invoice_id_active', table_name='payments')
+    op.execute("""
+        CREATE INDEX ix_payments_invoice_id_active
+        ON payments (invoice_id)
+        INCLUDE (amount)
+        WHERE deleted_at IS NULL
+    """)
+
+    # Index-only scans need all-visible pages; vacuum payments more eagerly so the
+    # visibility map stays fresh as new payments are inserted
+    op.execute("""
+        ALTER TABLE payments SET (autovacuum_vacuum_scale_factor = 0.05)
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        ALTER TABLE payments RESET (autovacuum_vacuum_scale_factor)
+    """)
+
+    op.drop_index('ix_payments_invoice_id_active', table_name='payments')
+    op.execute("""
+        CREATE INDEX ix_payments_invoice_id_active
+        ON payments (invoice_id)
+        WHERE deleted_at IS NULL
+    """)
@@ -0,0 +1,77 @@
+"""denormalize_invoice_paid_amount
+
+Revision ID: 4c4b1025f05e
+Revises: ede16f9f16ef
+Create Date: 2026-10-16 15:02:47.318452
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '4c4b1025f05e'
+down_revision: Union[str, None] = 'ede16f9f16ef'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _drop_statement_indexes() -> None:
+    op.drop_index('ix_invoices_issue_date_active', table_name='invoices')
+    op.drop_index('ix_invoices_student_issue_date_active', table_name='invoices')
+
+
+def upgrade() -> None:
+    # Sum of the invoice's non-deleted payments (BIGINT cents), maintained by
+    # PaymentService when a payment is recorded, so statements read it next to
+    # total_amount instead of aggregating payments per request
+    op.execute("""
+        ALTER TABLE invoices ADD COLUMN paid_amount BIGINT NOT NULL DEFAULT 0
+    """)
+    op.execute("""
+        UPDATE invoices i
+        SET paid_amount = p.paid
+        FROM (
+            SELECT invoice_id, SUM(amount) AS paid
+            FROM payments
+            WHERE NOT is_deleted
+            GROUP BY invoice_id
+        ) p
+        WHERE p.invoice_id = i.id
+    """)
+
+    # Carry paid_amount in the statement indexes so totals and rows stay
+    # index-only scans now that payments are no longer joined
+    # Used in: SELECT SUM(total_amount), SUM(paid_amount) FROM invoices
+    #          WHERE student_id = ? AND deleted_at IS NULL AND status <> 3
+    #          AND issue_date >= ? AND issue_date <= ?
+    _drop_statement_indexes()
+    op.execute("""
+        CREATE INDEX ix_invoices_student_issue_date_active
+        ON invoices (student_id, issue_date)
+        INCLUDE (total_amount, paid_amount, status, due_date, id)
+        WHERE deleted_at IS NULL AND status <> 3
+    """)
+    op.execute("""
+        CREATE INDEX ix_invoices_issue_date_active
+        ON invoices (issue_date)
+        INCLUDE (student_id, total_amount, paid_amount, id, due_date, status)
+        WHERE deleted_at IS NULL AND status <> 3
+    """)
+
+
+def downgrade() -> None:
+    _drop_statement_indexes()
+    op.execute("""
+        CREATE INDEX ix_invoices_student_issue_date_active
+        ON invoices (student_id, issue_date)
+        INCLUDE (total_amount, status, due_date, id)
+        WHERE deleted_at IS NULL AND status <> 3
+    """)
+    op.execute("""
+        CREATE INDEX ix_invoices_issue_date_active
+        ON invoices (issue_date)
+        INCLUDE (student_id, total_amount, id, due_date, status)
+        WHERE deleted_at IS NULL AND status <> 3
+    """)
+    op.drop_column('invoices', 'paid_amount')
@@ -0,0 +1,40 @@
+"""cover_invoice_issue_date_partial_index
+
+Revision ID: 70d3063df64f
+Revises: 7d7a584fc788
+Create Date: 2026-10-16 09:54:12.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '70d3063df64f'
+down_revision: Union[str, None] = '7d7a584fc788'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # School statements filter invoices by issue_date and join on student_id;
+    # carrying the projected columns lets the join be fed from the index alone.
+    # Used in: SELECT invoices.id, student_id, issue_date, due_date, status,
+    #          total_amount FROM invoices JOIN students WHERE deleted_at IS NULL
+    #          AND status != 'cancelled' AND issue_date >= ? AND issue_date <= ?
+    op.drop_index('ix_invoices_issue_date_active', table_name='invoices')
+    op.execute("""
+        CREATE INDEX ix_invoices_issue_date_active
+        ON invoices (issue_date)
+        INCLUDE (student_id, total_amount, id, due_date, status)
+        WHERE deleted_at IS NULL AND status != 'CANCELLED'
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_invoices_issue_date_active', table_name='invoices')
+    op.execute("""
+        CREATE INDEX ix_invoices_issue_date_active
+        ON invoices (issue_date)
+        WHERE deleted_at IS NULL AND status != 'CANCELLED'
+    """)
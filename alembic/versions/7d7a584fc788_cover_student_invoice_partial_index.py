@@ -0,0 +1,41 @@
+"""cover_student_invoice_partial_index
+
+Revision ID: 7d7a584fc788
+Revises: 48f5d961507b
+Create Date: 2026-10-16 09:31:47.120563
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '7d7a584fc788'
+down_revision: Union[str, None] = '48f5d961507b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Student statements read total_amount, status, due_date and id for every
+    # matching invoice; carrying them in the index allows an Index Only Scan.
+    # The partial predicate is kept identical so existing queries still match it.
+    # Used in: SELECT id, issue_date, due_date, status, total_amount FROM invoices
+    #          WHERE student_id = ? AND deleted_at IS NULL AND status != 'cancelled'
+    #          AND issue_date >= ? AND issue_date <= ?
+    op.drop_index('ix_invoices_student_issue_date_active', table_name='invoices')
+    op.execute("""
+        CREATE INDEX ix_invoices_student_issue_date_active
+        ON invoices (student_id, issue_date)
+        INCLUDE (total_amount, status, due_date, id)
+        WHERE deleted_at IS NULL AND status != 'CANCELLED'
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_invoices_student_issue_date_active', table_name='invoices')
+    op.execute("""
+        CREATE INDEX ix_invoices_student_issue_date_active
+        ON invoices (student_id, issue_date)
+        WHERE deleted_at IS NULL AND status != 'CANCELLED'
+    """)
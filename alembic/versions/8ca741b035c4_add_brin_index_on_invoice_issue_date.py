@@ -0,0 +1,34 @@
+"""add_brin_index_on_invoice_issue_date
+
+Revision ID: 8ca741b035c4
+Revises: ecb8f63ef369
+Create Date: 2026-10-16 11:24:51.093127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '8ca741b035c4'
+down_revision: Union[str, None] = 'ecb8f63ef369'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Invoices are inserted roughly in issue_date order, so a BRIN index stays tiny
+    # (one summary per 32 pages) and lets wide date-range scans skip whole blocks.
+    # The B-tree covering indexes are kept for per-student and narrow lookups.
+    # Used in: SELECT ... FROM invoices JOIN students ...
+    #          WHERE deleted_at IS NULL AND issue_date >= ? AND issue_date <= ?
+    op.execute("""
+        CREATE INDEX ix_invoices_issue_date_brin
+        ON invoices USING BRIN (issue_date)
+        WITH (pages_per_range = 32)
+        WHERE deleted_at IS NULL
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_invoices_issue_date_brin', table_name='invoices')
@@ -0,0 +1,42 @@
+"""store_money_as_bigint_cents
+
+Revision ID: 9cc321139cc8
+Revises: 3490aa4af5ee
+Create Date: 2026-10-16 12:14:09.572841
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '9cc321139cc8'
+down_revision: Union[str, None] = '3490aa4af5ee'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONEY_COLUMNS = (
+    ('invoices', 'total_amount'),
+    ('invoice_items', 'unit_price'),
+    ('invoice_items', 'total_amount'),
+    ('payments', 'amount'),
+)
+
+
+def upgrade() -> None:
+    # Money is stored as integer cents (see app.models.types.Money) so SUM() and
+    # comparisons run on int8 instead of NUMERIC. Indexes that INCLUDE these
+    # columns are rebuilt automatically by ALTER COLUMN ... TYPE.
+    for table, column in MONEY_COLUMNS:
+        op.execute(f"""
+            ALTER TABLE {table}
+            ALTER COLUMN {column} TYPE BIGINT USING ROUND({column} * 100)::BIGINT
+        """)
+
+
+def downgrade() -> None:
+    for table, column in MONEY_COLUMNS:
+        op.execute(f"""
+            ALTER TABLE {table}
+            ALTER COLUMN {column} TYPE NUMERIC(10, 2) USING ({column} / 100.0)
+        """)
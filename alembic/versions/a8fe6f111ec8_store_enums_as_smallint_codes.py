@@ -0,0 +1,90 @@
+"""store_enums_as_smallint_codes
+
+Revision ID: a8fe6f111ec8
+Revises: 70d3063df64f
+Create Date: 2026-10-16 10:27:39.551208
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8fe6f111ec8'
+down_revision: Union[str, None] = '70d3063df64f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column, enum type name, labels in code order) - codes must match the
+# *_CODES mappings declared next to each enum in app/models
+ENUM_COLUMNS = [
+    ('invoices', 'status', 'invoicestatus', ['PENDING', 'PAID', 'OVERDUE', 'CANCELLED']),
+    ('students', 'status', 'studentstatus', ['ACTIVE', 'INACTIVE', 'GRADUATED']),
+    ('payments', 'payment_method', 'paymentmethod', ['CASH', 'CARD', 'TRANSFER', 'CHECK']),
+    ('users', 'role', 'user_role', ['ADMIN', 'USER']),
+]
+
+
+def _drop_invoice_status_indexes() -> None:
+    # Both partial indexes reference status in their predicate/INCLUDE list
+    op.drop_index('ix_invoices_issue_date_active', table_name='invoices')
+    op.drop_index('ix_invoices_student_issue_date_active', table_name='invoices')
+
+
+def upgrade() -> None:
+    _drop_invoice_status_indexes()
+
+    for table, column, type_name, labels in ENUM_COLUMNS:
+        cases = ' '.join(
+            f"WHEN '{label}' THEN {code}" for code, label in enumerate(labels)
+        )
+        op.execute(f"""
+            ALTER TABLE {table}
+            ALTER COLUMN {column} TYPE smallint
+            USING CASE {column} {cases} END
+        """)
+        op.execute(f"DROP TYPE {type_name}")
+
+    # Recreate the statement indexes; 3 = InvoiceStatus.CANCELLED
+    op.execute("""
+        CREATE INDEX ix_invoices_student_issue_date_active
+        ON invoices (student_id, issue_date)
+        INCLUDE (total_amount, status, due_date, id)
+        WHERE deleted_at IS NULL AND status <> 3
+    """)
+    op.execute("""
+        CREATE INDEX ix_invoices_issue_date_active
+        ON invoices (issue_date)
+        INCLUDE (student_id, total_amount, id, due_date, status)
+        WHERE deleted_at IS NULL AND status <> 3
+    """)
+
+
+def downgrade() -> None:
+    _drop_invoice_status_indexes()
+
+    for table, column, type_name, labels in ENUM_COLUMNS:
+        enum_labels = ', '.join(f"'{label}'" for label in labels)
+        cases = ' '.join(
+            f"WHEN {code} THEN '{label}'" for code, label in enumerate(labels)
+        )
+        op.execute(f"CREATE TYPE {type_name} AS ENUM ({enum_labels})")
+        op.execute(f"""
+            ALTER TABLE {table}
+            ALTER COLUMN {column} TYPE {type_name}
+            USING (CASE {column} {cases} END)::{type_name}
+        """)
+
+    op.execute("""
+        CREATE INDEX ix_invoices_student_issue_date_active
+        ON invoices (student_id, issue_date)
+        INCLUDE (total_amount, status, due_date, id)
+        WHERE deleted_at IS NULL AND status != 'CANCELLED'
+    """)
+    op.execute("""
+        CREATE INDEX ix_invoices_issue_date_active
+        ON invoices (issue_date)
+        INCLUDE (student_id, total_amount, id, due_date, status)
+        WHERE deleted_at IS NULL AND status != 'CANCELLED'
+    """)
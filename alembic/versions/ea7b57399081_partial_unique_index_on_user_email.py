@@ -0,0 +1,35 @@
+"""partial_unique_index_on_user_email
+
+Revision ID: ea7b57399081
+Revises: a8fe6f111ec8
+Create Date: 2026-10-16 10:58:21.736045
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'ea7b57399081'
+down_revision: Union[str, None] = 'a8fe6f111ec8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Replace the full unique index with one over live users only. Inactive users
+    # stay in the index so they keep their email and can still be rejected with 403.
+    # Used in: SELECT id, email, hashed_password, role, is_active FROM users
+    #          WHERE email = ? AND deleted_at IS NULL
+    op.drop_index('ix_users_email', table_name='users')
+    op.execute("""
+        CREATE UNIQUE INDEX ix_users_email_active
+        ON users (email)
+        INCLUDE (hashed_password, role, is_active, id)
+        WHERE deleted_at IS NULL
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_email_active', table_name='users')
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
@@ -0,0 +1,38 @@
+"""server_side_timestamp_defaults
+
+Revision ID: ecb8f63ef369
+Revises: ea7b57399081
+Create Date: 2026-10-16 11:02:18.447310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'ecb8f63ef369'
+down_revision: Union[str, None] = 'ea7b57399081'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CREATED_AT_TABLES = ('schools', 'students', 'invoices', 'invoice_items', 'payments', 'users')
+UPDATED_AT_TABLES = ('schools', 'students', 'invoices', 'users')
+
+
+def upgrade() -> None:
+    # Timestamps are now filled by the database on INSERT instead of being
+    # computed in Python for every row. updated_at is still bumped by the ORM on
+    # UPDATE, but as a now() SQL expression rather than a bound Python value.
+    for table in CREATED_AT_TABLES:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN created_at SET DEFAULT now()")
+
+    for table in UPDATED_AT_TABLES:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN updated_at SET DEFAULT now()")
+
+
+def downgrade() -> None:
+    for table in UPDATED_AT_TABLES:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN updated_at DROP DEFAULT")
+
+    for table in CREATED_AT_TABLES:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN created_at DROP DEFAULT")
@@ -0,0 +1,60 @@
+"""add_school_monthly_statement_view
+
+Revision ID: ede16f9f16ef
+Revises: 16df68f0c348
+Create Date: 2026-10-16 14:31:08.517204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'ede16f9f16ef'
+down_revision: Union[str, None] = '16df68f0c348'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Pre-aggregated school statement totals per calendar month. Statements sum
+    # a handful of rows for the whole elapsed months of their range instead of
+    # every invoice in them (only when STATEMENT_MONTHLY_VIEW_ENABLED is set).
+    # Same filters as the live statement query: active students, active
+    # non-cancelled invoices (status code 3), non-deleted payments. Amounts are
+    # BIGINT cents, like the source columns.
+    # Used in: SELECT SUM(total_invoiced), SUM(total_paid)
+    #          FROM school_monthly_statement
+    #          WHERE school_id = ? AND month >= ? AND month < ?
+    # Not refreshed on write: run REFRESH MATERIALIZED VIEW CONCURRENTLY
+    # school_monthly_statement on a schedule (e.g. nightly)
+    op.execute("""
+        CREATE MATERIALIZED VIEW school_monthly_statement AS
+        SELECT
+            s.school_id,
+            date_trunc('month', i.issue_date)::date AS month,
+            SUM(i.total_amount)::bigint AS total_invoiced,
+            COALESCE(SUM(p.paid), 0)::bigint AS total_paid
+        FROM invoices i
+        JOIN students s ON s.id = i.student_id
+        LEFT JOIN (
+            SELECT invoice_id, SUM(amount) AS paid
+            FROM payments
+            WHERE NOT is_deleted
+            GROUP BY invoice_id
+        ) p ON p.invoice_id = i.id
+        WHERE s.deleted_at IS NULL
+          AND i.deleted_at IS NULL
+          AND i.status != 3
+        GROUP BY s.school_id, date_trunc('month', i.issue_date)
+    """)
+
+    # Required by REFRESH ... CONCURRENTLY (and serves the lookup above)
+    op.execute("""
+        CREATE UNIQUE INDEX ux_school_monthly_statement_school_month
+        ON school_monthly_statement (school_id, month)
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW school_monthly_statement")
@@ -1,17 +1,207 @@
+import hashlib
+import threading
+import time
+
+import jwt
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
 
+from app.core.cache import bump_namespace, cache_get, cache_set, namespace_version
 from app.core.config import settings
 from app.core.database import get_db
 from app.core.security import ALGORITHM
 from app.models.user import User, UserRole
+from app.schemas.user import UserRead
 from app.services.user_service import UserService
 
 # OAuth2 scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+# Resolved users keyed by the SHA-256 digest of the access token (raw tokens are
+# never kept around). Entries hold plain column values rather than ORM instances
+# so they are never bound to an already closed Session.
+# A hit is only served while the user's generation is unchanged, both locally
+# and in Redis (one GET per request), so a committed write in any worker applies
+# from the next request everywhere. Without REDIS_URL that holds per process
+# only, and other workers may serve the old row until the TTL expires.
+# TTLCache is not thread-safe and sync dependencies run in the threadpool.
+_user_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+_user_cache_lock = threading.Lock()
+
+# Shared (Redis) tier: user columns keyed by email, so other processes and
+# restarted workers skip the user query too. Token -> email needs no cache: the
+# sub claim is read from the verified token itself.
+_SHARED_USER_CACHE_TTL_SECONDS = 300
+
+# Generation of each user's cached entries, bumped after every committed write.
+# Loads snapshot it before querying, so a lookup racing a write caches its (old)
+# row under the previous generation, where no later request will read it.
+_user_versions: dict[str, int] = {}
+
+# Session.info key collecting the users written in the current transaction
+_WRITTEN_USERS_KEY = "written_user_emails"
+
+# Per-token locks for lookups in progress, so a burst of requests carrying the
+# same token issues a single user query instead of one per request
+_inflight_tokens: dict[str, threading.Lock] = {}
+
+# Prepared once at import; tokens without exp/sub claims are rejected by PyJWT
+_SECRET_KEY: bytes = settings.SECRET_KEY.encode()
+_ALGORITHMS = [ALGORITHM]
+_DECODE_KWARGS = {
+    "key": _SECRET_KEY,
+    "algorithms": _ALGORITHMS,
+    "options": {"require": ["exp", "sub"]},
+}
+
+# Columns needed to rebuild the user for authorization checks and /auth/me
+_CACHED_USER_FIELDS = (
+    "id",
+    "email",
+    "full_name",
+    "role",
+    "is_active",
+    "created_at",
+    "updated_at",
+    "deleted_at",
+)
+
+
+def _token_key(token: str) -> str:
+    """Cache key for a token: its SHA-256 hex digest"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _user_namespace(email: str) -> str:
+    """Cache namespace of a single user's shared entries"""
+    return f"user:{email}"
+
+
+def invalidate_cached_user(email: str) -> None:
+    """Drop every cached token resolution for the given user"""
+    with _user_cache_lock:
+        _user_versions[email] = _user_versions.get(email, 0) + 1
+        stale_keys = [
+            key
+            for key, (fields, *_rest) in _user_cache.items()
+            if fields["email"] == email
+        ]
+        for key in stale_keys:
+            _user_cache.pop(key, None)
+    bump_namespace(_user_namespace(email))
+
+
+def clear_user_cache() -> None:
+    """Drop all cached token resolutions"""
+    with _user_cache_lock:
+        _user_cache.clear()
+        _user_versions.clear()
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _record_user_write(mapper, connection, target: User) -> None:
+    # Flushed but not yet committed: invalidating now would let a concurrent
+    # request re-cache the old row before the new one is visible
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_WRITTEN_USERS_KEY, set()).add(target.email)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_written_users(session: Session) -> None:
+    # Role/activation/password changes and soft deletes apply from the next request
+    for email in session.info.pop(_WRITTEN_USERS_KEY, ()):
+        invalidate_cached_user(email)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_written_users(session: Session, previous_transaction) -> None:
+    session.info.pop(_WRITTEN_USERS_KEY, None)
+
+
+def _get_cached_user(token_key: str) -> User | None:
+    """Return a transient User for a cached, still valid token resolution"""
+    with _user_cache_lock:
+        cached = _user_cache.get(token_key)
+        if cached is None:
+            return None
+        fields, expires_at, version, shared_version = cached
+        if version != _user_versions.get(fields["email"], 0):
+            return None
+    # Never outlive the token itself
+    if time.time() >= expires_at:
+        return None
+    # Written (and invalidated) by another worker since this entry was cached
+    if shared_version != namespace_version(_user_namespace(fields["email"])):
+        return None
+    return User(**fields)
+
+
+def _resolve_user(token: str, db: Session) -> User | None:
+    """Resolve a token to a user, using the in-process cache when possible
+
+    Returns a transient User built from cached column values on a cache hit, so
+    authenticated requests skip both JWT decoding and the user lookup query.
+    Concurrent misses for the same token are coalesced: one thread queries the
+    database while the others wait and then read its result from the cache.
+    """
+    token_key = _token_key(token)
+    user = _get_cached_user(token_key)
+    if user is not None:
+        return user
+
+    with _user_cache_lock:
+        inflight = _inflight_tokens.setdefault(token_key, threading.Lock())
+
+    try:
+        with inflight:
+            user = _get_cached_user(token_key)
+            if user is not None:
+                return user
+            return _load_user(token, token_key, db)
+    finally:
+        # A waiter may only get here after a newer burst installed its own lock
+        with _user_cache_lock:
+            if _inflight_tokens.get(token_key) is inflight:
+                del _inflight_tokens[token_key]
+
+
+def _load_user(token: str, token_key: str, db: Session) -> User | None:
+    """Decode the token, look the user up (Redis, then database) and cache it"""
+    try:
+        payload = jwt.decode(token, **_DECODE_KWARGS)
+    except jwt.PyJWTError:
+        return None
+    user_email: str = payload["sub"]
+
+    # Snapshot the generations before reading, see _user_versions
+    with _user_cache_lock:
+        version = _user_versions.get(user_email, 0)
+    shared_version = namespace_version(_user_namespace(user_email))
+    shared_key = f"{_user_namespace(user_email)}:v{shared_version}"
+    cached = cache_get(shared_key)
+    if cached is not None:
+        fields = UserRead.model_validate_json(cached).model_dump()
+        user = User(**fields)
+    else:
+        user = UserService.get_by_email(user_email, db)
+        if user is None:
+            return None
+        fields = {name: getattr(user, name) for name in _CACHED_USER_FIELDS}
+        cache_set(
+            shared_key,
+            UserRead.model_validate(user).model_dump_json(),
+            ttl=_SHARED_USER_CACHE_TTL_SECONDS,
+        )
+
+    with _user_cache_lock:
+        _user_cache[token_key] = (fields, payload["exp"], version, shared_version)
+    return user
+
 
 def get_current_user(
     token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
@@ -35,15 +225,7 @@ def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
-        user_email: str = payload.get("sub")
-        if user_email is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-
-    user = UserService.get_by_email(user_email, db)
+    user = _resolve_user(token, db)
     if user is None:
         raise credentials_exception
 
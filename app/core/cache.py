@@ -0,0 +1,78 @@
+import logging
+from typing import Optional
+
+import redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# TTL for cached single-entity reads; writes also invalidate explicitly
+ENTITY_CACHE_TTL_SECONDS = 60
+
+# Account statements aggregate over many rows, so writes cannot name the keys they
+# affect: every billing write bumps the namespace version instead, orphaning all
+# previously cached statements (left to expire by TTL)
+STATEMENT_NAMESPACE = "statement"
+
+# Dashboards poll identical statements; any billing write invalidates them sooner
+STATEMENT_CACHE_TTL_SECONDS = 60
+
+# Caching is optional: without REDIS_URL every lookup is a miss and writes are no-ops
+_client: Optional[redis.Redis] = (
+    redis.Redis.from_url(settings.REDIS_URL, socket_timeout=0.1)
+    if settings.REDIS_URL
+    else None
+)
+
+
+def cache_key(entity: str, entity_id: int) -> str:
+    """Build the cache key for a single entity (e.g. "school:42")"""
+    return f"{entity}:{entity_id}"
+
+
+def cache_get(key: str) -> Optional[bytes]:
+    """Return the cached value, or None on a miss (or if Redis is unavailable)"""
+    if _client is None:
+        return None
+    try:
+        return _client.get(key)
+    except redis.RedisError:
+        logger.warning("cache_get_failed", extra={"key": key})
+        return None
+
+
+def cache_set(key: str, value: str | bytes, ttl: int = ENTITY_CACHE_TTL_SECONDS) -> None:
+    """Store a value with a TTL (failures are logged and ignored)"""
+    if _client is None:
+        return
+    try:
+        _client.set(key, value, ex=ttl)
+    except redis.RedisError:
+        logger.warning("cache_set_failed", extra={"key": key})
+
+
+def cache_delete(*keys: str) -> None:
+    """Invalidate cached values (failures are logged and ignored)"""
+    if _client is None or not keys:
+        return
+    try:
+        _client.delete(*keys)
+    except redis.RedisError:
+        logger.warning("cache_delete_failed", extra={"key": ",".join(keys)})
+
+
+def namespace_version(namespace: str) -> int:
+    """Current version of a namespace (0 if never bumped or Redis is unavailable)"""
+    cached = cache_get(f"{namespace}:version")
+    return int(cached) if cached is not None else 0
+
+
+def bump_namespace(namespace: str) -> None:
+    """Invalidate every key built with the current namespace version"""
+    if _client is None:
+        return
+    try:
+        _client.incr(f"{namespace}:version")
+    except redis.RedisError:
+        logger.warning("cache_bump_failed", extra={"key": namespace})
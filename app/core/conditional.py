@@ -0,0 +1,29 @@
+from datetime import datetime
+
+from fastapi import Request, Response, status
+
+# Response header carrying the entity tag (sent back by clients in If-None-Match)
+ETAG_HEADER = "ETag"
+
+
+def entity_etag(entity_id: int, updated_at: datetime) -> str:
+    """Weak ETag derived from the primary key and last modification time"""
+    return f'W/"{entity_id}-{updated_at:%Y%m%d%H%M%S%f}"'
+
+
+def if_none_match(request: Request) -> list[str]:
+    """ETags listed in the request's If-None-Match header (empty if absent)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return []
+    return [tag.strip() for tag in header.split(",")]
+
+
+def etag_matches(tags: list[str], etag: str) -> bool:
+    """Whether the client's cached copy (If-None-Match tags) is still current"""
+    return "*" in tags or etag in tags
+
+
+def not_modified_response(etag: str) -> Response:
+    """304 response confirming the client's cached copy"""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={ETAG_HEADER: etag})
@@ -1,3 +1,6 @@
+from functools import lru_cache
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -7,10 +10,32 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str
     POSTGRES_DB: str
     PROJECT_NAME: str = "School Billing API"
+    # Connection pool sizing (per process); keep pool_size + max_overflow per worker
+    # below the database's max_connections (or PgBouncer's pool size)
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 3600
+    # Server-side cap on any single statement (PostgreSQL only, 0 disables) so a
+    # pathological query cannot pin a pool connection indefinitely
+    DB_STATEMENT_TIMEOUT_MS: int = 10000
     SECRET_KEY: str
+    # Secret mixed into password hashes (BLAKE2b key, max 64 bytes)
+    PEPPER: str = ""
+    # Optional Redis for read caching (caching is disabled when unset)
+    REDIS_URL: Optional[str] = None
+    # Serve the whole elapsed months of school statement totals from the
+    # school_monthly_statement materialized view (only as fresh as its last REFRESH)
+    STATEMENT_MONTHLY_VIEW_ENABLED: bool = False
 
     class Config:
         env_file = ".env"
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build the settings once (reads env vars and .env only on the first call)"""
+    return Settings()
+
+
+settings = get_settings()
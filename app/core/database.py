@@ -1,9 +1,33 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from app.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL)
+
+def _connect_args() -> dict:
+    """Per-connection settings applied by the driver at connect time"""
+    if make_url(settings.DATABASE_URL).get_backend_name() != "postgresql":
+        return {}
+
+    # Timestamp columns are naive UTC: now() (server defaults, updated_at bumps)
+    # is rendered in the session time zone, so pin it to match the UTC values
+    # set from Python (e.g. deleted_at)
+    options = ["-c timezone=UTC"]
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        options.append(f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}")
+    return {"options": " ".join(options)}
+
+
+engine = create_engine(
+    settings.DATABASE_URL,
+    connect_args=_connect_args(),
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    # Drop connections closed server-side (restarts, idle timeouts) before use
+    pool_pre_ping=True,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -1,5 +1,8 @@
 from prometheus_client import Counter, Histogram
 
+# Latency buckets tuned for API requests (1ms - 2.5s)
+API_LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
 # HTTP request metrics
 HTTP_REQUESTS_TOTAL = Counter(
     "http_requests_total",
@@ -11,6 +14,7 @@ HTTP_REQUEST_DURATION_SECONDS = Histogram(
     "http_request_duration_seconds",
     "HTTP request duration in seconds",
     ["method", "path"],
+    buckets=API_LATENCY_BUCKETS,
 )
 
 # Statement-specific metrics
@@ -20,6 +24,12 @@ SCHOOL_STATEMENT_REQUESTS_TOTAL = Counter(
     ["include_invoices"],
 )
 
+# Children bound once per include_invoices value, so requests skip label resolution
+SCHOOL_STATEMENT_REQUESTS = {
+    flag: SCHOOL_STATEMENT_REQUESTS_TOTAL.labels(include_invoices=str(flag).lower())
+    for flag in (True, False)
+}
+
 SCHOOL_STATEMENT_DURATION_SECONDS = Histogram(
     "school_statement_duration_seconds",
     "School statement generation duration",
@@ -31,6 +41,12 @@ STUDENT_STATEMENT_REQUESTS_TOTAL = Counter(
     ["include_invoices"],
 )
 
+# Children bound once per include_invoices value, so requests skip label resolution
+STUDENT_STATEMENT_REQUESTS = {
+    flag: STUDENT_STATEMENT_REQUESTS_TOTAL.labels(include_invoices=str(flag).lower())
+    for flag in (True, False)
+}
+
 STUDENT_STATEMENT_DURATION_SECONDS = Histogram(
     "student_statement_duration_seconds",
     "Student statement generation duration",
@@ -0,0 +1,54 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import HTTP_REQUEST_DURATION_SECONDS, HTTP_REQUESTS_TOTAL
+
+# Paths excluded from request metrics (scrapes and liveness/readiness probes)
+_SKIP_PATHS = frozenset({"/metrics", "/health", "/"})
+
+
+class PrometheusMiddleware:
+    """Pure ASGI middleware recording request count and latency
+
+    Unlike @app.middleware("http") (BaseHTTPMiddleware) it does not spawn a task
+    and memory stream per request; it only wraps `send` to capture the status code.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in _SKIP_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        # Reported as 500 if the app raises before starting a response
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start_time = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start_time
+
+            # Label by route template (e.g. /api/v1/students/{student_id}) rather
+            # than the raw URL so label cardinality is bounded by declared routes.
+            # The router stores the matched route in the shared scope.
+            route = scope.get("route")
+            path_template = route.path if route else "unmatched"
+            method = scope["method"]
+
+            HTTP_REQUESTS_TOTAL.labels(
+                method=method, path=path_template, status=status_code
+            ).inc()
+
+            HTTP_REQUEST_DURATION_SECONDS.labels(
+                method=method, path=path_template
+            ).observe(duration)
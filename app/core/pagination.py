@@ -0,0 +1,105 @@
+import base64
+import binascii
+from typing import Iterable, Iterator, Optional
+
+from fastapi import HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session
+
+# Response header carrying the cursor for the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Response header carrying the total number of matching rows (only on request)
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+# Rows fetched per round trip when streaming a list from a server-side cursor
+STREAM_BATCH_SIZE = 200
+
+
+def encode_cursor(last_id: int) -> str:
+    """Encode the last seen primary key as an opaque URL-safe cursor"""
+    return base64.urlsafe_b64encode(str(last_id).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    """Decode a cursor produced by encode_cursor
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
+def set_next_cursor(response: Response, rows: list, limit: int) -> None:
+    """Expose the next-page cursor when the page came back full"""
+    if len(rows) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1].id)
+
+
+def set_next_cursor_id(response: Response, last_id: Optional[int]) -> None:
+    """Expose the next-page cursor given the last id of a full page (if any)"""
+    if last_id is not None:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last_id)
+
+
+def set_total_count(response: Response, total: int) -> None:
+    """Expose the total number of matching rows"""
+    response.headers[TOTAL_COUNT_HEADER] = str(total)
+
+
+def list_response(adapter: TypeAdapter, rows: list) -> Response:
+    """Render ORM rows as a JSON array in a single pydantic-core call
+
+    The route's response_model still documents the schema; returning a Response
+    directly skips FastAPI's per-item validation and re-encoding.
+    """
+    items = adapter.validate_python(rows, from_attributes=True)
+    return Response(content=adapter.dump_json(items), media_type="application/json")
+
+
+def streaming_list_response(
+    adapter: TypeAdapter, rows: Iterable, db: Session
+) -> StreamingResponse:
+    """Stream ORM rows as a JSON array, serializing one element per row
+
+    adapter validates a single item. The session is closed once the body has been
+    sent (or the client went away): it must be owned by the stream, since the
+    request's get_db session is closed as soon as the endpoint returns.
+    """
+
+    def body() -> Iterator[bytes]:
+        try:
+            yield b"["
+            separator = b""
+            for row in rows:
+                item = adapter.validate_python(row, from_attributes=True)
+                yield separator + adapter.dump_json(item)
+                separator = b","
+            yield b"]"
+        finally:
+            db.close()
+
+    return StreamingResponse(body(), media_type="application/json")
+
+
+def streaming_ndjson_response(lines: Iterable[bytes], db: Session) -> StreamingResponse:
+    """Stream pre-serialized JSON documents as NDJSON (one per line)
+
+    As with streaming_list_response, the session feeding the lines is owned by
+    the stream and closed once the body has been sent (or the client went away).
+    """
+
+    def body() -> Iterator[bytes]:
+        try:
+            for line in lines:
+                yield line + b"\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
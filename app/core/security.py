@@ -1,26 +1,58 @@
+import hashlib
 from datetime import datetime, timedelta, timezone
 
-from jose import jwt
+import jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
 
-# Password hashing context using bcrypt
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context: argon2id for new hashes, bcrypt kept only to verify
+# (and lazily migrate) hashes created before the switch
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=2,
+    argon2__memory_cost=19456,
+    argon2__parallelism=1,
+)
 
 # JWT configuration
 ALGORITHM = "HS256"
+_SECRET_KEY: bytes = settings.SECRET_KEY.encode()
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
 
+def warm_up_hashers() -> None:
+    """Load the hash backends (called at startup) so the first login after a
+    deploy doesn't pay for importing argon2-cffi/bcrypt and selecting a backend"""
+    pwd_context.hash("warmup")
+    pwd_context.handler("bcrypt").get_backend()
+
+
+def _prehash(password: str) -> str:
+    """Peppered BLAKE2b digest of a password, fed to argon2 instead of the raw text"""
+    return hashlib.blake2b(
+        password.encode(), key=settings.PEPPER.encode(), digest_size=32
+    ).hexdigest()
+
+
 def hash_password(password: str) -> str:
-    """Hash a plain text password using bcrypt"""
-    return pwd_context.hash(password)
+    """Hash a plain text password using peppered argon2id"""
+    return pwd_context.hash(_prehash(password))
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain text password against a hashed password"""
-    return pwd_context.verify(plain_password, hashed_password)
+    # Legacy bcrypt hashes were computed from the raw password (no pepper)
+    if pwd_context.identify(hashed_password) == "bcrypt":
+        return pwd_context.verify(plain_password, hashed_password)
+    return pwd_context.verify(_prehash(plain_password), hashed_password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Whether a stored hash uses a deprecated scheme or outdated parameters"""
+    return pwd_context.needs_update(hashed_password)
 
 
 def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
@@ -45,5 +77,5 @@ def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
 
     to_encode.update({"exp": expire})
 
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
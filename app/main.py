@@ -1,51 +1,48 @@
 import logging
-import time
+from contextlib import asynccontextmanager
 
+import anyio.to_thread
 from fastapi import FastAPI, Request, Response
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.core.config import settings
-from app.core.metrics import HTTP_REQUEST_DURATION_SECONDS, HTTP_REQUESTS_TOTAL
+from app.core.middleware import PrometheusMiddleware
+from app.core.security import warm_up_hashers
 from app.routes import auth, invoices, schools, students
 
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Sync route handlers run in anyio's worker threads (40 by default). Match the
+    # thread limit to the connection pool so excess requests wait on the event loop
+    # instead of occupying threads that block on pool checkout until pool_timeout.
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    warm_up_hashers()
+    yield
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
 # Prometheus middleware for request metrics
-@app.middleware("http")
-async def prometheus_middleware(request: Request, call_next):
-    # Skip metrics endpoint itself
-    if request.url.path == "/metrics":
-        return await call_next(request)
-
-    start_time = time.time()
-    response = await call_next(request)
-    duration = time.time() - start_time
-
-    # Record metrics
-    HTTP_REQUESTS_TOTAL.labels(
-        method=request.method, path=request.url.path, status=response.status_code
-    ).inc()
-
-    HTTP_REQUEST_DURATION_SECONDS.labels(
-        method=request.method, path=request.url.path
-    ).observe(duration)
-
-    return response
+app.add_middleware(PrometheusMiddleware)
 
 
 # Global exception handlers
 @app.exception_handler(SQLAlchemyError)
 async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
     logger.exception("database_error", extra={"path": request.url.path})
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"message": "Unexpected server error"}
     )
@@ -54,7 +51,7 @@ async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
 @app.exception_handler(Exception)
 async def unhandled_exception_handler(request: Request, exc: Exception):
     logger.exception("unhandled_exception", extra={"path": request.url.path})
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"message": "Unexpected server error"}
     )
@@ -73,10 +70,10 @@ def metrics():
 
 
 @app.get("/health")
-def health_check():
+async def health_check():
     return {"status": "healthy"}
 
 
 @app.get("/")
-def root():
+async def root():
     return {"message": "School Billing API"}
@@ -1,11 +1,10 @@
 import enum
-from datetime import datetime, timezone
 
-from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, Numeric
-from sqlalchemy import Enum as SQLEnum
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer, func, text
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
+from app.models.types import CodedEnum, Money
 
 
 class InvoiceStatus(str, enum.Enum):
@@ -15,6 +14,15 @@ class InvoiceStatus(str, enum.Enum):
     CANCELLED = "cancelled"
 
 
+# On-disk SMALLINT codes (partial index predicates rely on CANCELLED = 3)
+INVOICE_STATUS_CODES = {
+    InvoiceStatus.PENDING: 0,
+    InvoiceStatus.PAID: 1,
+    InvoiceStatus.OVERDUE: 2,
+    InvoiceStatus.CANCELLED: 3,
+}
+
+
 class Invoice(Base):
     __tablename__ = "invoices"
 
@@ -22,16 +30,17 @@ class Invoice(Base):
     student_id = Column(Integer, ForeignKey("students.id"), nullable=False)
     issue_date = Column(Date, nullable=False)
     due_date = Column(Date, nullable=False)
-    total_amount = Column(Numeric(10, 2), nullable=False)
-    status = Column(SQLEnum(InvoiceStatus), default=InvoiceStatus.PENDING, nullable=False)
-    created_at = Column(
-        DateTime, default=lambda: datetime.now(timezone.utc), nullable=False
+    total_amount = Column(Money, nullable=False)
+    # Sum of the non-deleted payments, kept up to date by PaymentService.create
+    paid_amount = Column(Money, default=0, server_default="0", nullable=False)
+    status = Column(
+        CodedEnum(InvoiceStatus, INVOICE_STATUS_CODES),
+        default=InvoiceStatus.PENDING,
+        nullable=False,
     )
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
     updated_at = Column(
-        DateTime,
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
-        nullable=False,
+        DateTime, server_default=func.now(), onupdate=func.now(), nullable=False
     )
     deleted_at = Column(DateTime, nullable=True)
 
@@ -43,3 +52,50 @@ class Invoice(Base):
     payments = relationship(
         "Payment", back_populates="invoice", cascade="all, delete-orphan"
     )
+
+    # Statement indexes only cover active, non-cancelled invoices (3 = CANCELLED);
+    # the INCLUDE columns let totals and invoice rows run as Index Only Scans
+    __table_args__ = (
+        Index(
+            "ix_invoices_student_issue_date_active",
+            "student_id",
+            "issue_date",
+            postgresql_include=[
+                "total_amount",
+                "paid_amount",
+                "status",
+                "due_date",
+                "id",
+            ],
+            postgresql_where=text("deleted_at IS NULL AND status <> 3"),
+        ),
+        Index(
+            "ix_invoices_issue_date_active",
+            "issue_date",
+            postgresql_include=[
+                "student_id",
+                "total_amount",
+                "paid_amount",
+                "id",
+                "due_date",
+                "status",
+            ],
+            postgresql_where=text("deleted_at IS NULL AND status <> 3"),
+        ),
+        # Status-filtered invoice listings (keyset on id)
+        Index(
+            "ix_invoices_status_id_active",
+            "status",
+            "id",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        # Wide date-range scans skip whole blocks (rows arrive in issue_date order;
+        # never CLUSTER invoices on another key, that would defeat this index)
+        Index(
+            "ix_invoices_issue_date_brin",
+            "issue_date",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+    )
@@ -1,9 +1,8 @@
-from datetime import datetime, timezone
-
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, Numeric, String
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, func, text
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
+from app.models.types import Money
 
 
 class InvoiceItem(Base):
@@ -13,12 +12,21 @@ class InvoiceItem(Base):
     invoice_id = Column(Integer, ForeignKey("invoices.id"), nullable=False)
     description = Column(String(255), nullable=False)
     quantity = Column(Integer, nullable=False)
-    unit_price = Column(Numeric(10, 2), nullable=False)
-    total_amount = Column(Numeric(10, 2), nullable=False)
-    created_at = Column(
-        DateTime, default=lambda: datetime.now(timezone.utc), nullable=False
-    )
+    unit_price = Column(Money, nullable=False)
+    total_amount = Column(Money, nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
     deleted_at = Column(DateTime, nullable=True)
 
     # Relationships
     invoice = relationship("Invoice", back_populates="items")
+
+    __table_args__ = (
+        # Only active items are ever read; the INCLUDE columns let total
+        # recalculations and item listings run as an Index Only Scan
+        Index(
+            "ix_invoice_items_invoice_id_active",
+            "invoice_id",
+            postgresql_include=["description", "quantity", "unit_price", "total_amount"],
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+    )
@@ -1,11 +1,21 @@
 import enum
-from datetime import datetime, timezone
 
-from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, Numeric
-from sqlalchemy import Enum as SQLEnum
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    false,
+    func,
+    text,
+)
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
+from app.models.types import CodedEnum, Money
 
 
 class PaymentMethod(str, enum.Enum):
@@ -15,18 +25,38 @@ class PaymentMethod(str, enum.Enum):
     CHECK = "check"
 
 
+PAYMENT_METHOD_CODES = {
+    PaymentMethod.CASH: 0,
+    PaymentMethod.CARD: 1,
+    PaymentMethod.TRANSFER: 2,
+    PaymentMethod.CHECK: 3,
+}
+
+
 class Payment(Base):
     __tablename__ = "payments"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     invoice_id = Column(Integer, ForeignKey("invoices.id"), nullable=False)
     payment_date = Column(Date, nullable=False)
-    amount = Column(Numeric(10, 2), nullable=False)
-    payment_method = Column(SQLEnum(PaymentMethod), nullable=False)
-    created_at = Column(
-        DateTime, default=lambda: datetime.now(timezone.utc), nullable=False
+    amount = Column(Money, nullable=False)
+    payment_method = Column(
+        CodedEnum(PaymentMethod, PAYMENT_METHOD_CODES), nullable=False
     )
-    deleted_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    # Soft-delete flag; the deletion time was never read, only whether it was set
+    is_deleted = Column(Boolean, default=False, server_default=false(), nullable=False)
 
     # Relationships
     invoice = relationship("Invoice", back_populates="payments")
+
+    __table_args__ = (
+        # Payment listings only read live payments; amount is carried so sums
+        # over an invoice's payments are answered from the index alone
+        Index(
+            "ix_payments_invoice_id_active",
+            "invoice_id",
+            postgresql_include=["amount"],
+            postgresql_where=text("NOT is_deleted"),
+        ),
+    )
@@ -1,6 +1,4 @@
-from datetime import datetime, timezone
-
-from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy import Column, DateTime, Integer, String, func
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -14,14 +12,9 @@ class School(Base):
     name = Column(String(255), nullable=False)
     contact_email = Column(String(255), nullable=False)
     contact_phone = Column(String(50), nullable=False)
-    created_at = Column(
-        DateTime, default=lambda: datetime.now(timezone.utc), nullable=False
-    )
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
     updated_at = Column(
-        DateTime,
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
-        nullable=False,
+        DateTime, server_default=func.now(), onupdate=func.now(), nullable=False
     )
     deleted_at = Column(DateTime, nullable=True)
 
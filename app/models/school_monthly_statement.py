@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Date, Integer, MetaData, Table
+
+from app.models.types import Money
+
+# Read-only materialized view (created by migration, refreshed out of band).
+# Declared on its own MetaData so Base.metadata.create_all never creates it as a
+# plain table.
+school_monthly_statement = Table(
+    "school_monthly_statement",
+    MetaData(),
+    Column("school_id", Integer, primary_key=True),
+    Column("month", Date, primary_key=True),
+    Column("total_invoiced", Money, nullable=False),
+    Column("total_paid", Money, nullable=False),
+)
@@ -1,11 +1,20 @@
 import enum
-from datetime import datetime, timezone
 
-from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, String
-from sqlalchemy import Enum as SQLEnum
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    func,
+    text,
+)
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
+from app.models.types import CodedEnum
 
 
 class StudentStatus(str, enum.Enum):
@@ -14,6 +23,13 @@ class StudentStatus(str, enum.Enum):
     GRADUATED = "graduated"
 
 
+STUDENT_STATUS_CODES = {
+    StudentStatus.ACTIVE: 0,
+    StudentStatus.INACTIVE: 1,
+    StudentStatus.GRADUATED: 2,
+}
+
+
 class Student(Base):
     __tablename__ = "students"
 
@@ -26,15 +42,14 @@ class Student(Base):
     # separate student and guardian(parents) contacts
     email = Column(String(255), nullable=False)
     enrollment_date = Column(Date, nullable=False)
-    status = Column(SQLEnum(StudentStatus), default=StudentStatus.ACTIVE, nullable=False)
-    created_at = Column(
-        DateTime, default=lambda: datetime.now(timezone.utc), nullable=False
+    status = Column(
+        CodedEnum(StudentStatus, STUDENT_STATUS_CODES),
+        default=StudentStatus.ACTIVE,
+        nullable=False,
     )
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
     updated_at = Column(
-        DateTime,
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
-        nullable=False,
+        DateTime, server_default=func.now(), onupdate=func.now(), nullable=False
     )
     deleted_at = Column(DateTime, nullable=True)
 
@@ -43,3 +58,12 @@ class Student(Base):
     invoices = relationship(
         "Invoice", back_populates="student", cascade="all, delete-orphan"
     )
+
+    __table_args__ = (
+        # School statements count and join only live students of a school
+        Index(
+            "ix_students_school_id_active",
+            "school_id",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+    )
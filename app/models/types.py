@@ -0,0 +1,62 @@
+import enum
+from decimal import ROUND_HALF_UP, Decimal
+
+from sqlalchemy import BigInteger, SmallInteger
+from sqlalchemy.types import TypeDecorator
+
+
+class CodedEnum(TypeDecorator):
+    """Persist a Python enum as a fixed SMALLINT code
+
+    Python code and the API keep working with the enum members (and their string
+    values), while the database stores a 2-byte code. Codes are declared
+    explicitly so reordering enum members never changes what is stored on disk.
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_class: type[enum.Enum], codes: dict[enum.Enum, int]):
+        super().__init__()
+        self.enum_class = enum_class
+        # Stored as a tuple so the type stays hashable for SQLAlchemy's cache key
+        self.codes = tuple(codes.items())
+        self._code_by_member = dict(codes)
+        self._member_by_code = {code: member for member, code in codes.items()}
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return self._code_by_member[self.enum_class(value)]
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self._member_by_code[value]
+
+
+# Shared zero amount (Decimal is immutable): the start value for money sums
+ZERO_AMOUNT = Decimal("0")
+
+
+class Money(TypeDecorator):
+    """Persist a 2-decimal money amount as BIGINT cents
+
+    Python code and the API keep working with Decimal values, while the database
+    stores integer cents so SUM() and comparisons use native integer arithmetic.
+    Aggregates over a Money column (SUM, COALESCE) are converted back as well.
+    """
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        cents = (Decimal(str(value)) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP)
+        return int(cents)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return Decimal(int(value)).scaleb(-2)
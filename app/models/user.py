@@ -1,10 +1,9 @@
-from datetime import datetime, timezone
 from enum import Enum
 
-from sqlalchemy import Column, DateTime, Integer, String
-from sqlalchemy import Enum as SQLEnum
+from sqlalchemy import Column, DateTime, Index, Integer, String, func, text
 
 from app.core.database import Base
+from app.models.types import CodedEnum
 
 
 class UserRole(str, Enum):
@@ -14,26 +13,39 @@ class UserRole(str, Enum):
     USER = "user"
 
 
+USER_ROLE_CODES = {
+    UserRole.ADMIN: 0,
+    UserRole.USER: 1,
+}
+
+
 class User(Base):
     """User model for authentication"""
 
     __tablename__ = "users"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    email = Column(String(255), unique=True, index=True, nullable=False)
+    email = Column(String(255), nullable=False)
     hashed_password = Column(String, nullable=False)
     full_name = Column(String(255), nullable=True)
     role = Column(
-        SQLEnum(UserRole, name="user_role"), default=UserRole.USER, nullable=False
+        CodedEnum(UserRole, USER_ROLE_CODES), default=UserRole.USER, nullable=False
     )
     is_active = Column(Integer, default=1, nullable=False)
-    created_at = Column(
-        DateTime, default=lambda: datetime.now(timezone.utc), nullable=False
-    )
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
     updated_at = Column(
-        DateTime,
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
-        nullable=False,
+        DateTime, server_default=func.now(), onupdate=func.now(), nullable=False
     )
     deleted_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # Login lookups only ever target live users; the INCLUDE columns let
+        # credential checks run as an Index Only Scan
+        Index(
+            "ix_users_email_active",
+            "email",
+            unique=True,
+            postgresql_include=["hashed_password", "role", "is_active", "id"],
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+    )
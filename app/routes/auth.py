@@ -66,7 +66,7 @@ def login(
 
 
 @router.get("/me", response_model=UserRead)
-def get_current_user_profile(current_user: User = Depends(get_current_user)):
+async def get_current_user_profile(current_user: User = Depends(get_current_user)):
     """
     Get current user profile
 
@@ -0,0 +1,22 @@
+from fastapi import Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.models.invoice import Invoice
+from app.services.invoice_service import InvoiceService
+
+
+def get_invoice_or_404(invoice_id: int, db: Session = Depends(get_db)) -> Invoice:
+    """
+    Dependency resolving the invoice from the path (items eager-loaded)
+
+    FastAPI caches dependencies per request, so every dependant of the same request
+    shares one lookup.
+
+    Raises:
+        HTTPException: 404 if the invoice does not exist or is soft-deleted
+    """
+    invoice = InvoiceService.get_by_id(invoice_id, db)
+    if not invoice:
+        raise HTTPException(status_code=404, detail="Invoice not found")
+    return invoice
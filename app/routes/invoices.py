@@ -1,13 +1,36 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
 from app.core.auth import get_current_user, require_admin
+from app.core.conditional import (
+    ETAG_HEADER,
+    entity_etag,
+    etag_matches,
+    if_none_match,
+    not_modified_response,
+)
 from app.core.database import get_db
+from app.core.pagination import (
+    decode_cursor,
+    set_next_cursor_id,
+    set_total_count,
+    streaming_list_response,
+)
+from app.models.invoice import Invoice, InvoiceStatus
 from app.models.user import User
+from app.routes.dependencies import get_invoice_or_404
+from app.routes.params import (
+    CURSOR_QUERY,
+    INCLUDE_TOTAL_QUERY,
+    LIMIT_QUERY,
+    SKIP_QUERY,
+)
 from app.schemas.invoice import (
     InvoiceCreate,
+    InvoiceItemBulkCreate,
     InvoiceItemCreate,
     InvoiceItemRead,
     InvoiceRead,
@@ -19,6 +42,8 @@ from app.services.payment_service import PaymentService
 
 router = APIRouter(prefix="/invoices", tags=["invoices"])
 
+_INVOICE_ADAPTER = TypeAdapter(InvoiceRead)
+
 
 @router.post("/", response_model=InvoiceRead, status_code=201)
 def create_invoice(
@@ -32,31 +57,69 @@ def create_invoice(
 
 @router.get("/", response_model=List[InvoiceRead])
 def list_invoices(
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
-    limit: int = Query(100, ge=1, le=1000, description="Max number of records to return"),
-    status: Optional[str] = Query(
+    skip: int = SKIP_QUERY,
+    limit: int = LIMIT_QUERY,
+    cursor: Optional[str] = CURSOR_QUERY,
+    status: Optional[InvoiceStatus] = Query(
         None, description="Filter by invoice status (pending, paid, cancelled)"
     ),
+    include_total: bool = INCLUDE_TOTAL_QUERY,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """
     List all invoices (excluding soft-deleted) with pagination and optional
     status filter (requires authentication)
+
+    Follow the X-Next-Cursor response header (cursor param) for keyset pagination;
+    skip is kept for backwards compatibility. The total count is only computed
+    when include_total is set; omit it unless the client really needs it.
+
+    The body is streamed from a server-side cursor, so large pages are never
+    held in memory as a whole.
     """
-    return InvoiceService.get_all(db, skip=skip, limit=limit, status=status)
+    after_id = decode_cursor(cursor) if cursor else None
+    page = {"skip": skip, "limit": limit, "status": status, "after_id": after_id}
+
+    # The streamed rows outlive the request session: read them through a session
+    # owned (and closed) by the response body
+    stream_db = Session(bind=db.get_bind())
+    response = streaming_list_response(
+        _INVOICE_ADAPTER, InvoiceService.stream_all(stream_db, **page), stream_db
+    )
+    # Headers go out before the body, so the cursor comes from an id-only query
+    set_next_cursor_id(response, InvoiceService.page_last_id(db, **page))
+    if include_total:
+        set_total_count(response, InvoiceService.count(db, status=status))
+    return response
 
 
 @router.get("/{invoice_id}", response_model=InvoiceRead)
 def get_invoice(
+    request: Request,
+    response: Response,
     invoice_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Get an invoice by ID (requires authentication)"""
-    invoice = InvoiceService.get_by_id(invoice_id, db)
+    """
+    Get an invoice by ID (requires authentication)
+
+    Responds with an ETag; a request whose If-None-Match still matches gets a 304
+    after a single-column lookup.
+    """
+    tags = if_none_match(request)
+    if tags:
+        updated_at = InvoiceService.get_updated_at(invoice_id, db)
+        if updated_at is not None:
+            etag = entity_etag(invoice_id, updated_at)
+            if etag_matches(tags, etag):
+                return not_modified_response(etag)
+
+    invoice = InvoiceService.get_read_by_id(invoice_id, db)
     if not invoice:
         raise HTTPException(status_code=404, detail="Invoice not found")
+    response.headers[ETAG_HEADER] = entity_etag(invoice.id, invoice.updated_at)
     return invoice
 
 
@@ -68,10 +131,10 @@ def update_invoice(
     current_user: User = Depends(require_admin),
 ):
     """Update an invoice (requires admin role)"""
-    invoice = InvoiceService.get_by_id(invoice_id, db)
+    invoice = InvoiceService.update_by_id(invoice_id, invoice_update, db)
     if not invoice:
         raise HTTPException(status_code=404, detail="Invoice not found")
-    return InvoiceService.update(invoice, invoice_update, db)
+    return invoice
 
 
 @router.post("/{invoice_id}/cancel", response_model=InvoiceRead)
@@ -81,10 +144,10 @@ def cancel_invoice(
     current_user: User = Depends(require_admin),
 ):
     """Cancel an invoice (business action, not deletion) (requires admin role)"""
-    invoice = InvoiceService.get_by_id(invoice_id, db)
+    invoice = InvoiceService.cancel_by_id(invoice_id, db)
     if not invoice:
         raise HTTPException(status_code=404, detail="Invoice not found")
-    return InvoiceService.cancel(invoice, db)
+    return invoice
 
 
 # Nested routes for invoice items (Invoice is the aggregate root)
@@ -92,18 +155,31 @@ def cancel_invoice(
 
 @router.post("/{invoice_id}/items", response_model=InvoiceItemRead, status_code=201)
 def add_invoice_item(
-    invoice_id: int,
     item: InvoiceItemCreate,
+    invoice: Invoice = Depends(get_invoice_or_404),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin),
 ):
     """Add item to invoice (recalculates total) (requires admin role)"""
-    invoice = InvoiceService.get_by_id(invoice_id, db)
-    if not invoice:
-        raise HTTPException(status_code=404, detail="Invoice not found")
     return InvoiceService.add_item(invoice, item, db)
 
 
+@router.post(
+    "/{invoice_id}/items/bulk", response_model=List[InvoiceItemRead], status_code=201
+)
+def add_invoice_items(
+    items: InvoiceItemBulkCreate,
+    invoice: Invoice = Depends(get_invoice_or_404),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin),
+):
+    """
+    Add several items to an invoice in one request (recalculates total once)
+    (requires admin role)
+    """
+    return InvoiceService.add_items(invoice, items.items, db)
+
+
 @router.patch("/{invoice_id}/items/{item_id}", response_model=InvoiceItemRead)
 def update_invoice_item(
     invoice_id: int,
@@ -113,15 +189,10 @@ def update_invoice_item(
     current_user: User = Depends(require_admin),
 ):
     """Update invoice item (recalculates total) (requires admin role)"""
-    invoice = InvoiceService.get_by_id(invoice_id, db)
-    if not invoice:
-        raise HTTPException(status_code=404, detail="Invoice not found")
-
-    existing_item = InvoiceService.get_item(invoice_id, item_id, db)
-    if not existing_item:
+    updated_item = InvoiceService.update_item_by_id(invoice_id, item_id, item, db)
+    if not updated_item:
         raise HTTPException(status_code=404, detail="Invoice item not found")
-
-    return InvoiceService.update_item(existing_item, item, db)
+    return updated_item
 
 
 @router.delete("/{invoice_id}/items/{item_id}", status_code=204)
@@ -135,16 +206,10 @@ def delete_invoice_item(
     Soft delete invoice item (recalculates total, cannot delete last item)
     (requires admin role)
     """
-    invoice = InvoiceService.get_by_id(invoice_id, db)
-    if not invoice:
-        raise HTTPException(status_code=404, detail="Invoice not found")
-
-    existing_item = InvoiceService.get_item(invoice_id, item_id, db)
-    if not existing_item:
-        raise HTTPException(status_code=404, detail="Invoice item not found")
-
-    result = InvoiceService.delete_item(existing_item, db)
+    result = InvoiceService.delete_item_by_id(invoice_id, item_id, db)
     if result is None:
+        raise HTTPException(status_code=404, detail="Invoice item not found")
+    if not result:
         raise HTTPException(status_code=400, detail="Cannot delete last invoice item")
 
     return None
@@ -155,8 +220,8 @@ def delete_invoice_item(
 
 @router.post("/{invoice_id}/payments", response_model=PaymentRead, status_code=201)
 def create_payment(
-    invoice_id: int,
     payment: PaymentCreate,
+    invoice: Invoice = Depends(get_invoice_or_404),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -164,10 +229,6 @@ def create_payment(
     Create payment for invoice (cannot overpay, auto-updates status)
     (requires authentication)
     """
-    invoice = InvoiceService.get_by_id(invoice_id, db)
-    if not invoice:
-        raise HTTPException(status_code=404, detail="Invoice not found")
-
     try:
         return PaymentService.create(invoice, payment, db)
     except ValueError as e:
@@ -176,13 +237,9 @@ def create_payment(
 
 @router.get("/{invoice_id}/payments", response_model=List[PaymentRead])
 def list_payments(
-    invoice_id: int,
+    invoice: Invoice = Depends(get_invoice_or_404),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """List all payments for an invoice (requires authentication)"""
-    invoice = InvoiceService.get_by_id(invoice_id, db)
-    if not invoice:
-        raise HTTPException(status_code=404, detail="Invoice not found")
-
-    return PaymentService.get_by_invoice(invoice_id, db)
+    return PaymentService.get_reads_by_invoice(invoice.id, db)
@@ -0,0 +1,40 @@
+from fastapi import Query
+
+# Query parameter declarations shared by several routes. Declared once at import so
+# every route reuses the same Param objects instead of rebuilding them per module.
+
+# List endpoints
+# Offset pagination scans and discards the skipped rows; kept for existing clients
+SKIP_QUERY = Query(
+    0,
+    ge=0,
+    deprecated=True,
+    description="Number of records to skip (deprecated: use cursor instead)",
+)
+LIMIT_QUERY = Query(100, ge=1, le=1000, description="Max number of records to return")
+CURSOR_QUERY = Query(
+    None, description="Cursor from the X-Next-Cursor header of the previous page"
+)
+INCLUDE_TOTAL_QUERY = Query(
+    False,
+    description="Also return the total match count in X-Total-Count (extra query)",
+)
+
+# Account statement endpoints
+START_DATE_QUERY = Query(
+    ..., description="Filter invoices issued on or after this date (YYYY-MM-DD)"
+)
+END_DATE_QUERY = Query(
+    ..., description="Filter invoices issued on or before this date (YYYY-MM-DD)"
+)
+INCLUDE_INVOICES_QUERY = Query(
+    False, description="Whether to include the list of invoices in the response"
+)
+FORMAT_QUERY = Query(
+    "json",
+    alias="format",
+    description=(
+        "Response format: json, or ndjson to stream the statement followed by one "
+        "line per invoice"
+    ),
+)
@@ -1,24 +1,53 @@
 import time
 from datetime import date
-from typing import List
+from itertools import chain
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
 from app.core.auth import get_current_user, require_admin
+from app.core.conditional import (
+    ETAG_HEADER,
+    entity_etag,
+    etag_matches,
+    if_none_match,
+    not_modified_response,
+)
 from app.core.database import get_db
 from app.core.metrics import (
     SCHOOL_STATEMENT_DURATION_SECONDS,
-    SCHOOL_STATEMENT_REQUESTS_TOTAL,
+    SCHOOL_STATEMENT_REQUESTS,
+)
+from app.core.pagination import (
+    decode_cursor,
+    list_response,
+    set_next_cursor,
+    set_total_count,
+    streaming_ndjson_response,
 )
 from app.models.user import User
-from app.schemas.account_statement import SchoolAccountStatement
+from app.routes.params import (
+    CURSOR_QUERY,
+    END_DATE_QUERY,
+    FORMAT_QUERY,
+    INCLUDE_INVOICES_QUERY,
+    INCLUDE_TOTAL_QUERY,
+    LIMIT_QUERY,
+    SKIP_QUERY,
+    START_DATE_QUERY,
+)
+from app.schemas.account_statement import InvoiceStatementItem, SchoolAccountStatement
 from app.schemas.school import SchoolCreate, SchoolRead, SchoolUpdate
 from app.services.school_service import SchoolService
 from app.services.school_statement_service import SchoolStatementService
 
 router = APIRouter(prefix="/schools", tags=["schools"])
 
+_SCHOOL_LIST_ADAPTER = TypeAdapter(List[SchoolRead])
+
 
 @router.post("/", response_model=SchoolRead, status_code=201)
 def create_school(
@@ -32,28 +61,56 @@ def create_school(
 
 @router.get("/", response_model=List[SchoolRead])
 def list_schools(
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
-    limit: int = Query(100, ge=1, le=1000, description="Max number of records to return"),
+    skip: int = SKIP_QUERY,
+    limit: int = LIMIT_QUERY,
+    cursor: Optional[str] = CURSOR_QUERY,
+    include_total: bool = INCLUDE_TOTAL_QUERY,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """
     List all schools (excluding soft-deleted) with pagination
     (requires authentication)
+
+    Follow the X-Next-Cursor response header (cursor param) for keyset pagination;
+    skip is kept for backwards compatibility. The total count is only computed
+    when include_total is set; omit it unless the client really needs it.
     """
-    return SchoolService.get_all(db, skip=skip, limit=limit)
+    after_id = decode_cursor(cursor) if cursor else None
+    schools = SchoolService.get_all(db, skip=skip, limit=limit, after_id=after_id)
+    response = list_response(_SCHOOL_LIST_ADAPTER, schools)
+    set_next_cursor(response, schools, limit)
+    if include_total:
+        set_total_count(response, SchoolService.count(db))
+    return response
 
 
 @router.get("/{school_id}", response_model=SchoolRead)
 def get_school(
+    request: Request,
+    response: Response,
     school_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Get a school by ID (requires authentication)"""
-    school = SchoolService.get_by_id(school_id, db)
+    """
+    Get a school by ID (requires authentication)
+
+    Responds with an ETag; a request whose If-None-Match still matches gets a 304
+    after a single-column lookup.
+    """
+    tags = if_none_match(request)
+    if tags:
+        updated_at = SchoolService.get_updated_at(school_id, db)
+        if updated_at is not None:
+            etag = entity_etag(school_id, updated_at)
+            if etag_matches(tags, etag):
+                return not_modified_response(etag)
+
+    school = SchoolService.get_read_by_id(school_id, db)
     if not school:
         raise HTTPException(status_code=404, detail="School not found")
+    response.headers[ETAG_HEADER] = entity_etag(school.id, school.updated_at)
     return school
 
 
@@ -65,10 +122,10 @@ def update_school(
     current_user: User = Depends(require_admin),
 ):
     """Update a school (requires admin role)"""
-    school = SchoolService.get_by_id(school_id, db)
+    school = SchoolService.update_by_id(school_id, school_update, db)
     if not school:
         raise HTTPException(status_code=404, detail="School not found")
-    return SchoolService.update(school, school_update, db)
+    return school
 
 
 @router.delete("/{school_id}", status_code=204)
@@ -78,13 +135,49 @@ def delete_school(
     current_user: User = Depends(require_admin),
 ):
     """Soft delete a school (requires admin role)"""
-    school = SchoolService.get_by_id(school_id, db)
-    if not school:
+    if not SchoolService.delete_by_id(school_id, db):
         raise HTTPException(status_code=404, detail="School not found")
-    SchoolService.delete(school, db)
     return None
 
 
+def _stream_school_statement(
+    school_id: int,
+    start_date: date,
+    end_date: date,
+    include_invoices: bool,
+    db: Session,
+) -> StreamingResponse:
+    """NDJSON school statement: summary line, then one line per invoice
+
+    The invoice rows are read from a server-side cursor through a session owned by
+    the response body (the request session is closed once the endpoint returns).
+    """
+    statement = SchoolStatementService(
+        school_id=school_id, db=db, start_date=start_date, end_date=end_date
+    ).get_statement()
+    if not statement:
+        raise HTTPException(status_code=404, detail="School not found")
+    summary_line = (
+        SchoolAccountStatement.from_statement(statement)
+        .model_dump_json(exclude_none=True)
+        .encode()
+    )
+
+    stream_db = Session(bind=db.get_bind())
+    rows = (
+        SchoolStatementService(
+            school_id=school_id, db=stream_db, start_date=start_date, end_date=end_date
+        ).iter_invoice_rows()
+        if include_invoices
+        else ()
+    )
+    row_lines = (
+        InvoiceStatementItem.model_construct(**row).model_dump_json().encode()
+        for row in rows
+    )
+    return streaming_ndjson_response(chain([summary_line], row_lines), stream_db)
+
+
 @router.get(
     "/{school_id}/account-statement",
     response_model=SchoolAccountStatement,
@@ -92,15 +185,10 @@ def delete_school(
 )
 def get_school_account_statement(
     school_id: int,
-    start_date: date = Query(
-        ..., description="Filter invoices issued on or after this date (YYYY-MM-DD)"
-    ),
-    end_date: date = Query(
-        ..., description="Filter invoices issued on or before this date (YYYY-MM-DD)"
-    ),
-    include_invoices: bool = Query(
-        False, description="Whether to include the list of invoices in the response"
-    ),
+    start_date: date = START_DATE_QUERY,
+    end_date: date = END_DATE_QUERY,
+    include_invoices: bool = INCLUDE_INVOICES_QUERY,
+    response_format: Literal["json", "ndjson"] = FORMAT_QUERY,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin),
 ):
@@ -115,13 +203,18 @@ def get_school_account_statement(
       date (format: YYYY-MM-DD)
     - include_invoices (optional, default: false): Include the list of
       invoices in the response
+    - format (optional, default: json): ndjson streams the statement (without
+      invoices) on the first line, then one invoice per line
     """
     # Record metrics
-    SCHOOL_STATEMENT_REQUESTS_TOTAL.labels(
-        include_invoices=str(include_invoices).lower()
-    ).inc()
+    SCHOOL_STATEMENT_REQUESTS[include_invoices].inc()
 
-    start_time = time.time()
+    if response_format == "ndjson":
+        return _stream_school_statement(
+            school_id, start_date, end_date, include_invoices, db
+        )
+
+    start_time = time.perf_counter()
     service = SchoolStatementService(
         school_id=school_id,
         db=db,
@@ -129,11 +222,12 @@ def get_school_account_statement(
         end_date=end_date,
         include_invoices=include_invoices,
     )
-    statement = service.get_statement()
-    duration = time.time() - start_time
+    content = service.get_statement_json()
+    duration = time.perf_counter() - start_time
 
     SCHOOL_STATEMENT_DURATION_SECONDS.observe(duration)
 
-    if not statement:
+    if content is None:
         raise HTTPException(status_code=404, detail="School not found")
-    return statement
+    # Already serialized (response_model only documents the schema)
+    return Response(content=content, media_type="application/json")
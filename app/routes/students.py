@@ -1,24 +1,53 @@
 import time
 from datetime import date
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
 from app.core.auth import get_current_user, require_admin
+from app.core.conditional import (
+    ETAG_HEADER,
+    entity_etag,
+    etag_matches,
+    if_none_match,
+    not_modified_response,
+)
 from app.core.database import get_db
 from app.core.metrics import (
     STUDENT_STATEMENT_DURATION_SECONDS,
-    STUDENT_STATEMENT_REQUESTS_TOTAL,
+    STUDENT_STATEMENT_REQUESTS,
+)
+from app.core.pagination import (
+    decode_cursor,
+    list_response,
+    set_next_cursor,
+    set_total_count,
 )
 from app.models.user import User
-from app.schemas.account_statement import StudentAccountStatement
+from app.routes.params import (
+    CURSOR_QUERY,
+    END_DATE_QUERY,
+    INCLUDE_INVOICES_QUERY,
+    INCLUDE_TOTAL_QUERY,
+    LIMIT_QUERY,
+    SKIP_QUERY,
+    START_DATE_QUERY,
+)
+from app.schemas.account_statement import (
+    StudentAccountStatement,
+    StudentStatementsRequest,
+)
 from app.schemas.student import StudentCreate, StudentRead, StudentUpdate
 from app.services.student_service import StudentService
 from app.services.student_statement_service import StudentStatementService
 
 router = APIRouter(prefix="/students", tags=["students"])
 
+_STUDENT_LIST_ADAPTER = TypeAdapter(List[StudentRead])
+_STATEMENT_LIST_ADAPTER = TypeAdapter(List[StudentAccountStatement])
+
 
 @router.post("/", response_model=StudentRead, status_code=201)
 def create_student(
@@ -32,28 +61,56 @@ def create_student(
 
 @router.get("/", response_model=List[StudentRead])
 def list_students(
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
-    limit: int = Query(100, ge=1, le=1000, description="Max number of records to return"),
+    skip: int = SKIP_QUERY,
+    limit: int = LIMIT_QUERY,
+    cursor: Optional[str] = CURSOR_QUERY,
+    include_total: bool = INCLUDE_TOTAL_QUERY,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """
     List all students (excluding soft-deleted) with pagination
     (requires authentication)
+
+    Follow the X-Next-Cursor response header (cursor param) for keyset pagination;
+    skip is kept for backwards compatibility. The total count is only computed
+    when include_total is set; omit it unless the client really needs it.
     """
-    return StudentService.get_all(db, skip=skip, limit=limit)
+    after_id = decode_cursor(cursor) if cursor else None
+    students = StudentService.get_all(db, skip=skip, limit=limit, after_id=after_id)
+    response = list_response(_STUDENT_LIST_ADAPTER, students)
+    set_next_cursor(response, students, limit)
+    if include_total:
+        set_total_count(response, StudentService.count(db))
+    return response
 
 
 @router.get("/{student_id}", response_model=StudentRead)
 def get_student(
+    request: Request,
+    response: Response,
     student_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Get a student by ID (requires authentication)"""
-    student = StudentService.get_by_id(student_id, db)
+    """
+    Get a student by ID (requires authentication)
+
+    Responds with an ETag; a request whose If-None-Match still matches gets a 304
+    after a single-column lookup.
+    """
+    tags = if_none_match(request)
+    if tags:
+        updated_at = StudentService.get_updated_at(student_id, db)
+        if updated_at is not None:
+            etag = entity_etag(student_id, updated_at)
+            if etag_matches(tags, etag):
+                return not_modified_response(etag)
+
+    student = StudentService.get_read_by_id(student_id, db)
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
+    response.headers[ETAG_HEADER] = entity_etag(student.id, student.updated_at)
     return student
 
 
@@ -65,10 +122,10 @@ def update_student(
     current_user: User = Depends(require_admin),
 ):
     """Update a student (requires admin role)"""
-    student = StudentService.get_by_id(student_id, db)
+    student = StudentService.update_by_id(student_id, student_update, db)
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
-    return StudentService.update(student, student_update, db)
+    return student
 
 
 @router.delete("/{student_id}", status_code=204)
@@ -78,13 +135,38 @@ def delete_student(
     current_user: User = Depends(require_admin),
 ):
     """Soft delete a student (requires admin role)"""
-    student = StudentService.get_by_id(student_id, db)
-    if not student:
+    if not StudentService.delete_by_id(student_id, db):
         raise HTTPException(status_code=404, detail="Student not found")
-    StudentService.delete(student, db)
     return None
 
 
+@router.post("/account-statements", response_model=List[StudentAccountStatement])
+def get_student_account_statements(
+    statements_request: StudentStatementsRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin),
+):
+    """
+    Get summary account statements for several students in one request
+    (requires admin role)
+
+    Unknown or deleted students are omitted; invoice lists are not included.
+    """
+    statements = StudentStatementService.get_statements(
+        statements_request.student_ids,
+        db,
+        start_date=statements_request.start_date,
+        end_date=statements_request.end_date,
+    )
+    # Trusted DB values: construct without validation and serialize once
+    # (response_model only documents the schema)
+    content = _STATEMENT_LIST_ADAPTER.dump_json(
+        [StudentAccountStatement.from_statement(s) for s in statements],
+        exclude_none=True,
+    )
+    return Response(content=content, media_type="application/json")
+
+
 @router.get(
     "/{student_id}/account-statement",
     response_model=StudentAccountStatement,
@@ -92,15 +174,9 @@ def delete_student(
 )
 def get_student_account_statement(
     student_id: int,
-    start_date: date = Query(
-        ..., description="Filter invoices issued on or after this date (YYYY-MM-DD)"
-    ),
-    end_date: date = Query(
-        ..., description="Filter invoices issued on or before this date (YYYY-MM-DD)"
-    ),
-    include_invoices: bool = Query(
-        False, description="Whether to include the list of invoices in the response"
-    ),
+    start_date: date = START_DATE_QUERY,
+    end_date: date = END_DATE_QUERY,
+    include_invoices: bool = INCLUDE_INVOICES_QUERY,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin),
 ):
@@ -117,11 +193,9 @@ def get_student_account_statement(
       invoices in the response
     """
     # Record metrics
-    STUDENT_STATEMENT_REQUESTS_TOTAL.labels(
-        include_invoices=str(include_invoices).lower()
-    ).inc()
+    STUDENT_STATEMENT_REQUESTS[include_invoices].inc()
 
-    start_time = time.time()
+    start_time = time.perf_counter()
     service = StudentStatementService(
         student_id=student_id,
         db=db,
@@ -129,11 +203,12 @@ def get_student_account_statement(
         end_date=end_date,
         include_invoices=include_invoices,
     )
-    statement = service.get_statement()
-    duration = time.time() - start_time
+    content = service.get_statement_json()
+    duration = time.perf_counter() - start_time
 
     STUDENT_STATEMENT_DURATION_SECONDS.observe(duration)
 
-    if not statement:
+    if content is None:
         raise HTTPException(status_code=404, detail="Student not found")
-    return statement
+    # Already serialized (response_model only documents the schema)
+    return Response(content=content, media_type="application/json")
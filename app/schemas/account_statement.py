@@ -2,7 +2,7 @@ from datetime import date
 from decimal import Decimal
 from typing import List
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class PeriodSchema(BaseModel):
@@ -10,6 +10,14 @@ class PeriodSchema(BaseModel):
     end_date: date
 
 
+class StudentStatementsRequest(BaseModel):
+    """Batch of student statements requested in one call (summaries only)"""
+
+    student_ids: List[int] = Field(..., min_length=1, max_length=500)
+    start_date: date
+    end_date: date
+
+
 class SummarySchema(BaseModel):
     total_invoiced: Decimal
     total_paid: Decimal
@@ -28,6 +36,25 @@ class StatementInvoice(BaseModel):
     pending_amount: Decimal
 
 
+def _construct_statement(model, invoice_model, statement: dict):
+    """Build a statement model from a service statement dict
+
+    The values come straight from the database, so the models are constructed
+    without validation (model_construct) at every level.
+    """
+    invoices = statement["invoices"]
+    return model.model_construct(
+        **{
+            **statement,
+            "period": PeriodSchema.model_construct(**statement["period"]),
+            "summary": SummarySchema.model_construct(**statement["summary"]),
+            "invoices": None
+            if invoices is None
+            else [invoice_model.model_construct(**row) for row in invoices],
+        }
+    )
+
+
 class StudentAccountStatement(BaseModel):
     model_config = ConfigDict(exclude_none=True)
 
@@ -39,6 +66,11 @@ class StudentAccountStatement(BaseModel):
     summary: SummarySchema
     invoices: List[StatementInvoice] | None = None
 
+    @classmethod
+    def from_statement(cls, statement: dict) -> "StudentAccountStatement":
+        """Build from a statement dict produced by StudentStatementService"""
+        return _construct_statement(cls, StatementInvoice, statement)
+
 
 class InvoiceStatementItem(BaseModel):
     """Invoice item for school statements - includes student_id"""
@@ -62,3 +94,8 @@ class SchoolAccountStatement(BaseModel):
     student_count: int
     summary: SummarySchema
     invoices: List[InvoiceStatementItem] | None = None
+
+    @classmethod
+    def from_statement(cls, statement: dict) -> "SchoolAccountStatement":
+        """Build from a statement dict produced by SchoolStatementService"""
+        return _construct_statement(cls, InvoiceStatementItem, statement)
@@ -2,7 +2,7 @@ from datetime import date, datetime
 from decimal import Decimal
 from typing import List, Optional
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, ConfigDict, field_validator
 
 from app.models.invoice import InvoiceStatus
 
@@ -29,6 +29,17 @@ class InvoiceItemCreate(InvoiceItemBase):
         return v
 
 
+class InvoiceItemBulkCreate(BaseModel):
+    items: List[InvoiceItemCreate]
+
+    @field_validator("items")
+    @classmethod
+    def items_must_not_be_empty(cls, v):
+        if not v:
+            raise ValueError("At least one item is required")
+        return v
+
+
 class InvoiceItemRead(InvoiceItemBase):
     id: int
     invoice_id: int
@@ -36,8 +47,7 @@ class InvoiceItemRead(InvoiceItemBase):
     created_at: datetime
     deleted_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class InvoiceBase(BaseModel):
@@ -67,10 +77,12 @@ class InvoiceUpdate(BaseModel):
 class InvoiceRead(InvoiceBase):
     id: int
     total_amount: Decimal
+    # Denormalized sum of the invoice's payments (defaulted for cached reads
+    # serialized before the field existed)
+    paid_amount: Decimal = Decimal("0")
     created_at: datetime
     updated_at: datetime
     deleted_at: Optional[datetime] = None
     items: List[InvoiceItemRead] = []
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
@@ -1,8 +1,7 @@
 from datetime import date, datetime
 from decimal import Decimal
-from typing import Optional
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, ConfigDict, field_validator
 
 from app.models.payment import PaymentMethod
 
@@ -26,7 +25,5 @@ class PaymentRead(PaymentBase):
     id: int
     invoice_id: int
     created_at: datetime
-    deleted_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
@@ -1,59 +1,186 @@
 import logging
 from datetime import datetime, timezone
-from decimal import Decimal
-
-from sqlalchemy.orm import Session
-
+from typing import List, Optional
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session, aliased, joinedload, raiseload, selectinload
+
+from app.core.cache import (
+    STATEMENT_NAMESPACE,
+    bump_namespace,
+    cache_delete,
+    cache_get,
+    cache_key,
+    cache_set,
+)
+from app.core.pagination import STREAM_BATCH_SIZE
 from app.models.invoice import Invoice
 from app.models.invoice_item import InvoiceItem
-from app.schemas.invoice import InvoiceCreate, InvoiceItemCreate, InvoiceUpdate
+from app.models.types import ZERO_AMOUNT
+from app.schemas.invoice import (
+    InvoiceCreate,
+    InvoiceItemCreate,
+    InvoiceRead,
+    InvoiceUpdate,
+)
 
 logger = logging.getLogger(__name__)
 
 
 class InvoiceService:
     @staticmethod
-    def recalculate_total(invoice: Invoice, db: Session):
-        """Recalculate invoice total from non-deleted items"""
-        items = (
-            db.query(InvoiceItem)
-            .filter(
-                InvoiceItem.invoice_id == invoice.id, InvoiceItem.deleted_at.is_(None)
-            )
-            .all()
+    def _update_total(invoice_id: int, db: Session):
+        """Set the invoice total from its non-deleted items in a single UPDATE
+
+        The sum is a scalar subquery evaluated by the database (from the covering
+        partial index), so item rows never round-trip through Python. Does not
+        commit: callers apply it in the same transaction as the item change.
+        """
+        db.flush()
+        items_total = (
+            select(func.coalesce(func.sum(InvoiceItem.total_amount), 0))
+            .where(InvoiceItem.invoice_id == invoice_id, InvoiceItem.deleted_at.is_(None))
+            .scalar_subquery()
+        )
+        db.execute(
+            update(Invoice)
+            .where(Invoice.id == invoice_id)
+            .values(total_amount=items_total),
+            execution_options={"synchronize_session": False},
         )
 
-        total = Decimal("0")
-        for item in items:
-            total += item.total_amount
+    @staticmethod
+    def _list_query(db: Session, status: str = None, after_id: Optional[int] = None):
+        """Active invoices with the optional status and keyset filters applied"""
+        query = db.query(Invoice).filter(Invoice.deleted_at.is_(None))
+
+        if status:
+            query = query.filter(Invoice.status == status)
 
-        invoice.total_amount = total
-        db.commit()
-        db.refresh(invoice)
-        return invoice
+        if after_id is not None:
+            query = query.filter(Invoice.id > after_id)
+
+        return query
 
     @staticmethod
-    def get_all(db: Session, skip: int = 0, limit: int = 100, status: str = None):
+    def get_all(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        status: str = None,
+        after_id: Optional[int] = None,
+    ):
         """
         Get all invoices excluding soft-deleted with pagination and optional
         status filter
+
+        Pass after_id (keyset pagination) to read the page following that id
+        without scanning and discarding the skipped rows.
         """
-        query = db.query(Invoice).filter(Invoice.deleted_at.is_(None))
+        # Items are serialized with every invoice: load them for the whole page in
+        # one extra SELECT ... WHERE invoice_id IN (...) instead of one per invoice,
+        # and fail loudly if anything else gets lazy-loaded
+        return (
+            InvoiceService._list_query(db, status=status, after_id=after_id)
+            .options(selectinload(Invoice.items), raiseload("*"))
+            .order_by(Invoice.id)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
 
-        if status:
-            query = query.filter(Invoice.status == status)
+    @staticmethod
+    def stream_all(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        status: str = None,
+        after_id: Optional[int] = None,
+    ):
+        """
+        Same page as get_all, yielded row by row from a server-side cursor
 
-        return query.offset(skip).limit(limit).all()
+        Rows are fetched STREAM_BATCH_SIZE at a time (items selectin-loaded per
+        batch), so memory is bounded by the batch rather than the page.
+        """
+        yield from (
+            InvoiceService._list_query(db, status=status, after_id=after_id)
+            .options(selectinload(Invoice.items), raiseload("*"))
+            .order_by(Invoice.id)
+            .offset(skip)
+            .limit(limit)
+            .yield_per(STREAM_BATCH_SIZE)
+        )
+
+    @staticmethod
+    def page_last_id(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        status: str = None,
+        after_id: Optional[int] = None,
+    ) -> Optional[int]:
+        """Id of the last row of a full page (None if the page is not full)"""
+        return (
+            InvoiceService._list_query(db, status=status, after_id=after_id)
+            .with_entities(Invoice.id)
+            .order_by(Invoice.id)
+            .offset(skip + limit - 1)
+            .limit(1)
+            .scalar()
+        )
+
+    @staticmethod
+    def count(db: Session, status: str = None):
+        """Count invoices excluding soft-deleted with optional status filter"""
+        # Plain COUNT(*) (Query.count() would wrap a SELECT of every column)
+        stmt = (
+            select(func.count()).select_from(Invoice).where(Invoice.deleted_at.is_(None))
+        )
+        if status:
+            stmt = stmt.where(Invoice.status == status)
+        return db.scalar(stmt)
 
     @staticmethod
     def get_by_id(invoice_id: int, db: Session):
         """Get invoice by ID excluding soft-deleted"""
+        # Single row: fetch the items in the same query with a JOIN
         return (
             db.query(Invoice)
+            .options(joinedload(Invoice.items))
             .filter(Invoice.id == invoice_id, Invoice.deleted_at.is_(None))
             .first()
         )
 
+    @staticmethod
+    def get_updated_at(invoice_id: int, db: Session) -> Optional[datetime]:
+        """Last modification time of an active invoice (None if it does not exist)
+
+        Reads a single column, so conditional GETs can be answered without
+        loading the invoice.
+        """
+        return (
+            db.query(Invoice.updated_at)
+            .filter(Invoice.id == invoice_id, Invoice.deleted_at.is_(None))
+            .scalar()
+        )
+
+    @staticmethod
+    def get_read_by_id(invoice_id: int, db: Session) -> Optional[InvoiceRead]:
+        """Get invoice by ID as InvoiceRead, served from the cache when possible"""
+        key = cache_key("invoice", invoice_id)
+        cached = cache_get(key)
+        if cached is not None:
+            return InvoiceRead.model_validate_json(cached)
+
+        invoice = InvoiceService.get_by_id(invoice_id, db)
+        if invoice is None:
+            return None
+
+        invoice_read = InvoiceRead.model_validate(invoice)
+        cache_set(key, invoice_read.model_dump_json())
+        return invoice_read
+
     @staticmethod
     def create(invoice_in: InvoiceCreate, db: Session):
         """Create a new invoice with items"""
@@ -62,32 +189,33 @@ class InvoiceService:
             f"with {len(invoice_in.items)} items"
         )
 
-        # Calculate total from items
-        total_amount = Decimal("0")
-        for item in invoice_in.items:
-            item_total = Decimal(str(item.quantity)) * item.unit_price
-            total_amount += item_total
+        # Item rows and their totals computed in one pass
+        rows = [
+            {
+                "description": item.description,
+                "quantity": item.quantity,
+                "unit_price": item.unit_price,
+                "total_amount": item.unit_price * item.quantity,
+            }
+            for item in invoice_in.items
+        ]
 
         # Create invoice
         invoice_data = invoice_in.model_dump(exclude={"items"})
-        invoice_data["total_amount"] = total_amount
+        invoice_data["total_amount"] = sum(
+            (row["total_amount"] for row in rows), ZERO_AMOUNT
+        )
         invoice = Invoice(**invoice_data)
         db.add(invoice)
         db.flush()  # Get invoice ID
 
-        # Create invoice items
-        for item in invoice_in.items:
-            item_total = Decimal(str(item.quantity)) * item.unit_price
-            invoice_item = InvoiceItem(
-                invoice_id=invoice.id,
-                description=item.description,
-                quantity=item.quantity,
-                unit_price=item.unit_price,
-                total_amount=item_total,
-            )
-            db.add(invoice_item)
+        # Create invoice items with one multi-row INSERT (executemany)
+        for row in rows:
+            row["invoice_id"] = invoice.id
+        db.execute(insert(InvoiceItem), rows)
 
         db.commit()
+        bump_namespace(STATEMENT_NAMESPACE)
         db.refresh(invoice)
 
         logger.info(
@@ -97,32 +225,57 @@ class InvoiceService:
         return invoice
 
     @staticmethod
-    def update(invoice: Invoice, invoice_in: InvoiceUpdate, db: Session):
-        """Update an existing invoice"""
-        for field, value in invoice_in.model_dump(exclude_unset=True).items():
-            setattr(invoice, field, value)
+    def update_by_id(
+        invoice_id: int, invoice_in: InvoiceUpdate, db: Session
+    ) -> Optional[InvoiceRead]:
+        """Update an invoice with a single UPDATE ... RETURNING (plus one SELECT of
+        its items) and return it as InvoiceRead (None if not found)"""
+        invoice = db.execute(
+            update(Invoice)
+            .where(Invoice.id == invoice_id, Invoice.deleted_at.is_(None))
+            .values(**invoice_in.model_dump(exclude_unset=True))
+            .returning(Invoice)
+            .options(selectinload(Invoice.items))
+        ).scalar_one_or_none()
+        # Serialized before the commit expires the returned row, so the response
+        # needs no reload
+        invoice_read = (
+            InvoiceRead.model_validate(invoice) if invoice is not None else None
+        )
         db.commit()
-        db.refresh(invoice)
-        return invoice
+        cache_delete(cache_key("invoice", invoice_id))
+        bump_namespace(STATEMENT_NAMESPACE)
+        return invoice_read
 
     @staticmethod
-    def cancel(invoice: Invoice, db: Session):
-        """Cancel an invoice (business action)"""
+    def cancel_by_id(invoice_id: int, db: Session) -> Optional[InvoiceRead]:
+        """Cancel an invoice with a single UPDATE ... RETURNING (plus one SELECT of
+        its items) and return it as InvoiceRead (None if not found)"""
         from app.models.invoice import InvoiceStatus
 
-        logger.info(
-            f"Cancelling invoice: invoice_id={invoice.id}, "
-            f"student_id={invoice.student_id}, "
-            f"previous_status={invoice.status.value}, "
-            f"total_amount={invoice.total_amount}"
+        invoice = db.execute(
+            update(Invoice)
+            .where(Invoice.id == invoice_id, Invoice.deleted_at.is_(None))
+            .values(status=InvoiceStatus.CANCELLED)
+            .returning(Invoice)
+            .options(selectinload(Invoice.items))
+        ).scalar_one_or_none()
+        # Serialized before the commit expires the returned row, so the response
+        # needs no reload
+        invoice_read = (
+            InvoiceRead.model_validate(invoice) if invoice is not None else None
         )
-
-        invoice.status = InvoiceStatus.CANCELLED
         db.commit()
-        db.refresh(invoice)
-
-        logger.info(f"Invoice cancelled successfully: invoice_id={invoice.id}")
-        return invoice
+        cache_delete(cache_key("invoice", invoice_id))
+        bump_namespace(STATEMENT_NAMESPACE)
+
+        if invoice_read is not None:
+            logger.info(
+                f"Invoice cancelled successfully: invoice_id={invoice_read.id}, "
+                f"student_id={invoice_read.student_id}, "
+                f"total_amount={invoice_read.total_amount}"
+            )
+        return invoice_read
 
     @staticmethod
     def add_item(invoice: Invoice, item_in: InvoiceItemCreate, db: Session):
@@ -133,7 +286,7 @@ class InvoiceService:
             f"unit_price={item_in.unit_price}"
         )
 
-        item_total = Decimal(str(item_in.quantity)) * item_in.unit_price
+        item_total = item_in.unit_price * item_in.quantity
         invoice_item = InvoiceItem(
             invoice_id=invoice.id,
             description=item_in.description,
@@ -142,59 +295,137 @@ class InvoiceService:
             total_amount=item_total,
         )
         db.add(invoice_item)
+
+        # Recalculate invoice total in the same transaction
+        InvoiceService._update_total(invoice.id, db)
         db.commit()
+        cache_delete(cache_key("invoice", invoice.id))
+        bump_namespace(STATEMENT_NAMESPACE)
         db.refresh(invoice_item)
 
-        # Recalculate invoice total
-        InvoiceService.recalculate_total(invoice, db)
-
         logger.info(
             f"Item added to invoice: invoice_id={invoice.id}, item_id={invoice_item.id}"
         )
         return invoice_item
 
     @staticmethod
-    def update_item(item: InvoiceItem, item_in: InvoiceItemCreate, db: Session):
-        """Update invoice item and recalculate invoice total"""
-        item.description = item_in.description
-        item.quantity = item_in.quantity
-        item.unit_price = item_in.unit_price
-        item.total_amount = Decimal(str(item_in.quantity)) * item_in.unit_price
-        db.commit()
-        db.refresh(item)
+    def add_items(invoice: Invoice, items_in: List[InvoiceItemCreate], db: Session):
+        """Add several items with one multi-row INSERT and recalculate total once"""
+        logger.info(
+            f"Adding items to invoice: invoice_id={invoice.id}, count={len(items_in)}"
+        )
 
-        # Get invoice and recalculate total
-        invoice = db.query(Invoice).filter(Invoice.id == item.invoice_id).first()
-        if invoice:
-            InvoiceService.recalculate_total(invoice, db)
+        rows = [
+            {
+                "invoice_id": invoice.id,
+                "description": item_in.description,
+                "quantity": item_in.quantity,
+                "unit_price": item_in.unit_price,
+                "total_amount": item_in.unit_price * item_in.quantity,
+            }
+            for item_in in items_in
+        ]
+        items = db.scalars(insert(InvoiceItem).returning(InvoiceItem), rows).all()
+
+        # Recalculate invoice total in the same transaction
+        InvoiceService._update_total(invoice.id, db)
+        db.commit()
+        cache_delete(cache_key("invoice", invoice.id))
+        bump_namespace(STATEMENT_NAMESPACE)
 
-        return item
+        logger.info(
+            f"Items added to invoice: invoice_id={invoice.id}, count={len(items)}"
+        )
+        return items
 
     @staticmethod
-    def delete_item(item: InvoiceItem, db: Session):
-        """Soft delete invoice item and recalculate invoice total"""
-        # Check if it's the last item
-        remaining_items = (
-            db.query(InvoiceItem)
-            .filter(
-                InvoiceItem.invoice_id == item.invoice_id,
-                InvoiceItem.deleted_at.is_(None),
-                InvoiceItem.id != item.id,
-            )
-            .count()
+    def _active_item_filters(invoice_id: int, item_id: int):
+        """Filters matching an active item that belongs to an active invoice"""
+        invoice_is_active = (
+            select(Invoice.id)
+            .where(Invoice.id == invoice_id, Invoice.deleted_at.is_(None))
+            .exists()
         )
+        return [
+            InvoiceItem.id == item_id,
+            InvoiceItem.invoice_id == invoice_id,
+            InvoiceItem.deleted_at.is_(None),
+            invoice_is_active,
+        ]
 
-        if remaining_items == 0:
-            return None  # Cannot delete last item
+    @staticmethod
+    def update_item_by_id(
+        invoice_id: int, item_id: int, item_in: InvoiceItemCreate, db: Session
+    ):
+        """
+        Update an invoice item with a single UPDATE ... RETURNING and recalculate
+        the invoice total in the same transaction
 
-        item.deleted_at = datetime.now(timezone.utc)
+        Returns None if the invoice or the item does not exist.
+        """
+        item = db.execute(
+            update(InvoiceItem)
+            .where(*InvoiceService._active_item_filters(invoice_id, item_id))
+            .values(
+                description=item_in.description,
+                quantity=item_in.quantity,
+                unit_price=item_in.unit_price,
+                total_amount=item_in.unit_price * item_in.quantity,
+            )
+            .returning(InvoiceItem)
+        ).scalar_one_or_none()
+        if item is None:
+            return None
+
+        InvoiceService._update_total(invoice_id, db)
         db.commit()
+        cache_delete(cache_key("invoice", invoice_id))
+        bump_namespace(STATEMENT_NAMESPACE)
+        return item
 
-        # Get invoice and recalculate total
-        invoice = db.query(Invoice).filter(Invoice.id == item.invoice_id).first()
-        if invoice:
-            InvoiceService.recalculate_total(invoice, db)
+    @staticmethod
+    def delete_item_by_id(invoice_id: int, item_id: int, db: Session):
+        """
+        Soft delete an invoice item with a single UPDATE (only if another active
+        item remains) and recalculate the invoice total in the same transaction
 
+        Returns:
+            True if deleted, False if it is the last item, None if the invoice or
+            the item does not exist
+        """
+        other_item = aliased(InvoiceItem)
+        has_other_items = (
+            select(other_item.id)
+            .where(
+                other_item.invoice_id == invoice_id,
+                other_item.deleted_at.is_(None),
+                other_item.id != item_id,
+            )
+            .exists()
+        )
+        deleted_id = db.execute(
+            update(InvoiceItem)
+            .where(
+                *InvoiceService._active_item_filters(invoice_id, item_id),
+                has_other_items,
+            )
+            .values(deleted_at=datetime.now(timezone.utc))
+            .returning(InvoiceItem.id)
+        ).scalar_one_or_none()
+
+        if deleted_id is None:
+            # Only the failure path pays for telling "missing" from "last item"
+            db.rollback()
+            if InvoiceService.get_by_id(invoice_id, db) is None:
+                return None
+            if InvoiceService.get_item(invoice_id, item_id, db) is None:
+                return None
+            return False
+
+        InvoiceService._update_total(invoice_id, db)
+        db.commit()
+        cache_delete(cache_key("invoice", invoice_id))
+        bump_namespace(STATEMENT_NAMESPACE)
         return True
 
     @staticmethod
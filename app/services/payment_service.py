@@ -1,13 +1,29 @@
 import logging
+from typing import List
 
+from pydantic import TypeAdapter
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
+from app.core.cache import (
+    STATEMENT_NAMESPACE,
+    bump_namespace,
+    cache_delete,
+    cache_get,
+    cache_key,
+    cache_set,
+)
 from app.models.invoice import Invoice, InvoiceStatus
 from app.models.payment import Payment
-from app.schemas.payment import PaymentCreate
+from app.schemas.payment import PaymentCreate, PaymentRead
 
 logger = logging.getLogger(__name__)
 
+# Payment lists are polled often; keep them short-lived on top of the invalidation
+PAYMENTS_CACHE_TTL_SECONDS = 30
+
+_payment_list_adapter = TypeAdapter(List[PaymentRead])
+
 
 class PaymentService:
     @staticmethod
@@ -21,23 +37,29 @@ class PaymentService:
             f"invoice_status={invoice.status.value}"
         )
 
-        # Calculate total paid so far
-        existing_payments = (
-            db.query(Payment)
-            .filter(Payment.invoice_id == invoice.id, Payment.deleted_at.is_(None))
-            .all()
-        )
-
-        total_paid = sum(p.amount for p in existing_payments)
-        new_total_paid = total_paid + payment_in.amount
+        # Check for overpayment and increment the denormalized paid amount in one
+        # conditional UPDATE: the row lock serializes concurrent payments on the
+        # invoice, so together they can never exceed its total
+        invoice_id = invoice.id
+        new_amounts = db.execute(
+            update(Invoice)
+            .where(
+                Invoice.id == invoice_id,
+                Invoice.paid_amount + payment_in.amount <= Invoice.total_amount,
+            )
+            .values(paid_amount=Invoice.paid_amount + payment_in.amount)
+            .returning(Invoice.paid_amount, Invoice.total_amount),
+            execution_options={"synchronize_session": False},
+        ).one_or_none()
 
-        # Check for overpayment
-        if new_total_paid > invoice.total_amount:
-            remaining = invoice.total_amount - total_paid
+        if new_amounts is None:
+            # Only the rejection path reads the current amounts back
+            db.refresh(invoice)
+            remaining = invoice.total_amount - invoice.paid_amount
             logger.warning(
-                f"Payment rejected (overpayment): invoice_id={invoice.id}, "
+                f"Payment rejected (overpayment): invoice_id={invoice_id}, "
                 f"attempted_amount={payment_in.amount}, remaining={remaining}, "
-                f"would_result_in={new_total_paid}"
+                f"would_result_in={invoice.paid_amount + payment_in.amount}"
             )
             raise ValueError(
                 f"Payment would exceed invoice total. Remaining amount: {remaining}"
@@ -45,23 +67,28 @@ class PaymentService:
 
         # Create payment
         payment = Payment(
-            invoice_id=invoice.id,
+            invoice_id=invoice_id,
             payment_date=payment_in.payment_date,
             amount=payment_in.amount,
             payment_method=payment_in.payment_method,
         )
         db.add(payment)
 
-        # Update invoice status
-        if new_total_paid >= invoice.total_amount:
+        # Update invoice status from the amounts the UPDATE returned
+        new_total_paid, total = new_amounts
+        if new_total_paid >= total:
             invoice.status = InvoiceStatus.PAID
 
         db.commit()
+        # New payment for the list; the invoice status may have changed to PAID
+        cache_delete(cache_key("payments", invoice_id), cache_key("invoice", invoice_id))
+        bump_namespace(STATEMENT_NAMESPACE)
+        # Only the payment is returned (server-side created_at); the expired
+        # invoice is reloaded lazily if a caller reads it again
         db.refresh(payment)
-        db.refresh(invoice)
 
         logger.info(
-            f"Payment created: payment_id={payment.id}, invoice_id={invoice.id}, "
+            f"Payment created: payment_id={payment.id}, invoice_id={invoice_id}, "
             f"amount={payment.amount}"
         )
         return payment
@@ -71,10 +98,29 @@ class PaymentService:
         """Get all payments for an invoice"""
         return (
             db.query(Payment)
-            .filter(Payment.invoice_id == invoice_id, Payment.deleted_at.is_(None))
+            .filter(Payment.invoice_id == invoice_id, ~Payment.is_deleted)
+            .order_by(Payment.id)
             .all()
         )
 
+    @staticmethod
+    def get_reads_by_invoice(invoice_id: int, db: Session) -> List[PaymentRead]:
+        """Get all payments for an invoice as PaymentRead, cached per invoice"""
+        key = cache_key("payments", invoice_id)
+        cached = cache_get(key)
+        if cached is not None:
+            return _payment_list_adapter.validate_json(cached)
+
+        payments = _payment_list_adapter.validate_python(
+            PaymentService.get_by_invoice(invoice_id, db), from_attributes=True
+        )
+        cache_set(
+            key,
+            _payment_list_adapter.dump_json(payments),
+            ttl=PAYMENTS_CACHE_TTL_SECONDS,
+        )
+        return payments
+
     @staticmethod
     def get_by_id(payment_id: int, invoice_id: int, db: Session):
         """Get payment by ID (must belong to invoice)"""
@@ -83,7 +129,7 @@ class PaymentService:
             .filter(
                 Payment.id == payment_id,
                 Payment.invoice_id == invoice_id,
-                Payment.deleted_at.is_(None),
+                ~Payment.is_deleted,
             )
             .first()
         )
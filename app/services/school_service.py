@@ -1,21 +1,44 @@
 from datetime import datetime, timezone
+from typing import Optional
 
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session
 
+from app.core.cache import (
+    STATEMENT_NAMESPACE,
+    bump_namespace,
+    cache_delete,
+    cache_get,
+    cache_key,
+    cache_set,
+)
 from app.models.school import School
-from app.schemas.school import SchoolCreate, SchoolUpdate
+from app.schemas.school import SchoolCreate, SchoolRead, SchoolUpdate
 
 
 class SchoolService:
     @staticmethod
-    def get_all(db: Session, skip: int = 0, limit: int = 100):
-        """Get all schools excluding soft-deleted with pagination"""
-        return (
-            db.query(School)
-            .filter(School.deleted_at.is_(None))
-            .offset(skip)
-            .limit(limit)
-            .all()
+    def get_all(
+        db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
+    ):
+        """
+        Get all schools excluding soft-deleted with pagination
+
+        Pass after_id (keyset pagination) to read the page following that id
+        without scanning and discarding the skipped rows.
+        """
+        query = db.query(School).filter(School.deleted_at.is_(None))
+
+        if after_id is not None:
+            query = query.filter(School.id > after_id)
+
+        return query.order_by(School.id).offset(skip).limit(limit).all()
+
+    @staticmethod
+    def count(db: Session):
+        """Count schools excluding soft-deleted"""
+        return db.scalar(
+            select(func.count()).select_from(School).where(School.deleted_at.is_(None))
         )
 
     @staticmethod
@@ -27,6 +50,35 @@ class SchoolService:
             .first()
         )
 
+    @staticmethod
+    def get_updated_at(school_id: int, db: Session) -> Optional[datetime]:
+        """Last modification time of an active school (None if it does not exist)
+
+        Reads a single column, so conditional GETs can be answered without
+        loading the school.
+        """
+        return (
+            db.query(School.updated_at)
+            .filter(School.id == school_id, School.deleted_at.is_(None))
+            .scalar()
+        )
+
+    @staticmethod
+    def get_read_by_id(school_id: int, db: Session) -> Optional[SchoolRead]:
+        """Get school by ID as SchoolRead, served from the cache when possible"""
+        key = cache_key("school", school_id)
+        cached = cache_get(key)
+        if cached is not None:
+            return SchoolRead.model_validate_json(cached)
+
+        school = SchoolService.get_by_id(school_id, db)
+        if school is None:
+            return None
+
+        school_read = SchoolRead.model_validate(school)
+        cache_set(key, school_read.model_dump_json())
+        return school_read
+
     @staticmethod
     def create(school_in: SchoolCreate, db: Session):
         """Create a new school"""
@@ -37,17 +89,34 @@ class SchoolService:
         return school
 
     @staticmethod
-    def update(school: School, school_in: SchoolUpdate, db: Session):
-        """Update an existing school"""
-        for field, value in school_in.model_dump(exclude_unset=True).items():
-            setattr(school, field, value)
+    def update_by_id(
+        school_id: int, school_in: SchoolUpdate, db: Session
+    ) -> Optional[SchoolRead]:
+        """Update a school in a single UPDATE ... RETURNING and return it as
+        SchoolRead (None if not found)"""
+        school = db.execute(
+            update(School)
+            .where(School.id == school_id, School.deleted_at.is_(None))
+            .values(**school_in.model_dump(exclude_unset=True))
+            .returning(School)
+        ).scalar_one_or_none()
+        # Serialized before the commit expires the returned row, so the response
+        # needs no reload
+        school_read = SchoolRead.model_validate(school) if school is not None else None
         db.commit()
-        db.refresh(school)
-        return school
+        cache_delete(cache_key("school", school_id))
+        bump_namespace(STATEMENT_NAMESPACE)
+        return school_read
 
     @staticmethod
-    def delete(school: School, db: Session):
-        """Soft delete a school"""
-        school.deleted_at = datetime.now(timezone.utc)
+    def delete_by_id(school_id: int, db: Session):
+        """Soft delete a school in a single UPDATE (False if not found)"""
+        result = db.execute(
+            update(School)
+            .where(School.id == school_id, School.deleted_at.is_(None))
+            .values(deleted_at=datetime.now(timezone.utc))
+        )
         db.commit()
-        return True
+        cache_delete(cache_key("school", school_id))
+        bump_namespace(STATEMENT_NAMESPACE)
+        return result.rowcount > 0
@@ -1,18 +1,142 @@
 import logging
-from datetime import date
+from datetime import date, timedelta
 from decimal import Decimal
+from typing import Iterator
 
-from sqlalchemy import func
+from sqlalchemy import bindparam, func, or_, select
 from sqlalchemy.orm import Session
 
-from app.models.invoice import Invoice
-from app.models.payment import Payment
+from app.core.cache import (
+    STATEMENT_CACHE_TTL_SECONDS,
+    STATEMENT_NAMESPACE,
+    cache_get,
+    cache_set,
+    namespace_version,
+)
+from app.core.config import settings
+from app.core.pagination import STREAM_BATCH_SIZE
+from app.models.invoice import Invoice, InvoiceStatus
 from app.models.school import School
+from app.models.school_monthly_statement import school_monthly_statement
 from app.models.student import Student
+from app.models.types import ZERO_AMOUNT
+from app.schemas.account_statement import SchoolAccountStatement
 
 logger = logging.getLogger(__name__)
 
 
+def _school_invoice_filters(school_id, start_date, end_date) -> list:
+    """Filter conditions for a school's statement invoices (values or bindparams)"""
+    return [
+        Student.school_id == school_id,
+        Student.deleted_at.is_(None),
+        Invoice.deleted_at.is_(None),
+        Invoice.status != InvoiceStatus.CANCELLED,
+        Invoice.issue_date >= start_date,
+        Invoice.issue_date <= end_date,
+    ]
+
+
+def _student_count_query(school_id):
+    """Scalar subquery counting the school's active students"""
+    return (
+        select(func.count(Student.id))
+        .where(Student.school_id == school_id, Student.deleted_at.is_(None))
+        .scalar_subquery()
+    )
+
+
+def _live_totals_queries(school_id, start_date, end_date, *extra_filters):
+    """Scalar subqueries aggregating the matching invoices' invoiced and paid amounts
+
+    The matching invoices are selected once in a CTE and reused for both the
+    invoiced and the paid aggregate (paid_amount is denormalized on the invoice).
+    """
+    school_invoices = (
+        select(Invoice.total_amount, Invoice.paid_amount)
+        .join(Student, Invoice.student_id == Student.id)
+        .where(*_school_invoice_filters(school_id, start_date, end_date), *extra_filters)
+        .cte("school_invoices")
+    )
+
+    total_invoiced_query = select(
+        func.coalesce(func.sum(school_invoices.c.total_amount), 0)
+    ).scalar_subquery()
+
+    total_paid_query = select(
+        func.coalesce(func.sum(school_invoices.c.paid_amount), 0)
+    ).scalar_subquery()
+
+    return total_invoiced_query, total_paid_query
+
+
+def _view_totals_queries(school_id, first_month, end_month):
+    """Scalar subqueries summing the monthly view over [first_month, end_month)"""
+    view = school_monthly_statement
+    view_filters = [
+        view.c.school_id == school_id,
+        view.c.month >= first_month,
+        view.c.month < end_month,
+    ]
+    return (
+        select(func.coalesce(func.sum(view.c.total_invoiced), 0))
+        .where(*view_filters)
+        .scalar_subquery(),
+        select(func.coalesce(func.sum(view.c.total_paid), 0))
+        .where(*view_filters)
+        .scalar_subquery(),
+    )
+
+
+# The statement queries are built once at import with bound parameters, so each
+# request only binds values: no per-request construction of the CTE/subquery tree
+# or cache-key generation, and the compiled SQL is reused from the engine cache.
+# One row (none if the school does not exist): school name, student count, then
+# (invoiced, paid) pairs (live, then view if used)
+_SCHOOL_ID = bindparam("school_id")
+_START_DATE = bindparam("start_date")
+_END_DATE = bindparam("end_date")
+_FIRST_MONTH = bindparam("first_month")
+_END_MONTH = bindparam("end_month")
+
+_SCHOOL_ACTIVE = (School.id == _SCHOOL_ID, School.deleted_at.is_(None))
+
+_SCHOOL_TOTALS_STMT = select(
+    School.name,
+    _student_count_query(_SCHOOL_ID),
+    *_live_totals_queries(_SCHOOL_ID, _START_DATE, _END_DATE),
+).where(*_SCHOOL_ACTIVE)
+
+# Whole elapsed months from the monthly view, residual days aggregated live
+_SCHOOL_TOTALS_WITH_VIEW_STMT = select(
+    School.name,
+    _student_count_query(_SCHOOL_ID),
+    *_live_totals_queries(
+        _SCHOOL_ID,
+        _START_DATE,
+        _END_DATE,
+        or_(Invoice.issue_date < _FIRST_MONTH, Invoice.issue_date >= _END_MONTH),
+    ),
+    *_view_totals_queries(_SCHOOL_ID, _FIRST_MONTH, _END_MONTH),
+).where(*_SCHOOL_ACTIVE)
+
+# Invoice breakdown: only the row columns are selected (covered by the partial
+# index, no full entity hydration); paid_amount is denormalized on the invoice
+_SCHOOL_INVOICE_ROWS_STMT = (
+    select(
+        Invoice.id,
+        Invoice.student_id,
+        Invoice.issue_date,
+        Invoice.due_date,
+        Invoice.status,
+        Invoice.total_amount,
+        Invoice.paid_amount,
+    )
+    .join(Student, Invoice.student_id == Student.id)
+    .where(*_school_invoice_filters(_SCHOOL_ID, _START_DATE, _END_DATE))
+)
+
+
 class SchoolStatementService:
     """Service for generating school account statements"""
 
@@ -39,135 +163,118 @@ class SchoolStatementService:
         self.end_date = end_date
         self.include_invoices = include_invoices
 
-    def _get_school_and_student_count(self) -> tuple[School, int] | None:
-        """Fetch school and count active students (validation + existence check)
+    def _view_months(self) -> tuple[date, date] | None:
+        """Whole, already elapsed calendar months inside the range
+
+        These are the months served from the monthly materialized view; the
+        partial months at either end and the current month are aggregated live.
 
         Returns:
-            Tuple of (school, student_count) if school exists, None otherwise
+            Half-open range [first_month, end_month) of month starts, or None if
+            the range contains no such month
         """
-        school = (
-            self.db.query(School)
-            .filter(School.id == self.school_id, School.deleted_at.is_(None))
-            .first()
+        first_month = self.start_date.replace(day=1)
+        if first_month < self.start_date:
+            first_month = (first_month + timedelta(days=31)).replace(day=1)
+
+        # First month not fully covered by the range, capped at the current month
+        end_month = min(
+            (self.end_date + timedelta(days=1)).replace(day=1),
+            date.today().replace(day=1),
         )
 
-        if not school:
+        if first_month >= end_month:
             return None
+        return first_month, end_month
 
-        student_count = (
-            self.db.query(Student)
-            .filter(Student.school_id == self.school_id, Student.deleted_at.is_(None))
-            .count()
-        )
-
-        return school, student_count
-
-    def _school_invoice_base_filters(self):
-        """
-        Return common filter conditions for school invoice queries
+    def _get_school_totals(
+        self,
+    ) -> tuple[str, int, Decimal, Decimal, Decimal] | None:
+        """Fetch the school, count its students and aggregate invoice totals
 
-        Returns:
-            List of filter conditions that can be unpacked into .filter()
-        """
-        return [
-            Student.school_id == self.school_id,
-            Student.deleted_at.is_(None),
-            Invoice.deleted_at.is_(None),
-            Invoice.status != "cancelled",
-            Invoice.issue_date >= self.start_date,
-            Invoice.issue_date <= self.end_date,
-        ]
-
-    def _calculate_totals(self) -> tuple[Decimal, Decimal, Decimal]:
-        """Aggregate totals for school invoices (pure aggregation logic)
+        Existence check, school name, student count and the sums come from a
+        single statement (no row if the school does not exist). When
+        STATEMENT_MONTHLY_VIEW_ENABLED is set, whole elapsed months are summed from
+        the monthly materialized view and only the residual days are aggregated
+        from the invoices.
 
         Returns:
-            Tuple of (total_invoiced, total_paid, total_pending)
+            Tuple of (school_name, student_count, total_invoiced, total_paid,
+            total_pending) if the school exists, None otherwise
         """
-        # Query for total_invoiced with date filters
-        total_invoiced_result = (
-            self.db.query(func.coalesce(func.sum(Invoice.total_amount), 0))
-            .join(Student, Invoice.student_id == Student.id)
-            .filter(*self._school_invoice_base_filters())
-            .scalar()
+        params = {
+            "school_id": self.school_id,
+            "start_date": self.start_date,
+            "end_date": self.end_date,
+        }
+        view_months = (
+            self._view_months() if settings.STATEMENT_MONTHLY_VIEW_ENABLED else None
         )
 
-        total_invoiced: Decimal = total_invoiced_result or Decimal("0")
+        if view_months is None:
+            stmt = _SCHOOL_TOTALS_STMT
+        else:
+            stmt = _SCHOOL_TOTALS_WITH_VIEW_STMT
+            params["first_month"], params["end_month"] = view_months
 
-        # Query for total_paid with date filters on invoice issue_date
-        total_paid_result = (
-            self.db.query(func.coalesce(func.sum(Payment.amount), 0))
-            .join(Invoice, Payment.invoice_id == Invoice.id)
-            .join(Student, Invoice.student_id == Student.id)
-            .filter(*self._school_invoice_base_filters(), Payment.deleted_at.is_(None))
-            .scalar()
-        )
+        row = self.db.execute(stmt, params).one_or_none()
+        if row is None:
+            return None
 
-        total_paid: Decimal = total_paid_result or Decimal("0")
+        school_name: str = row[0]
+        student_count: int = row[1]
+        # Live (invoiced, paid) pair, followed by the view pair when used
+        total_invoiced: Decimal = sum(row[2::2], ZERO_AMOUNT)
+        total_paid: Decimal = sum(row[3::2], ZERO_AMOUNT)
         total_pending: Decimal = total_invoiced - total_paid
 
-        return total_invoiced, total_paid, total_pending
+        return school_name, student_count, total_invoiced, total_paid, total_pending
+
+    def _invoice_rows_params(self) -> dict:
+        """Bound values for _SCHOOL_INVOICE_ROWS_STMT"""
+        return {
+            "school_id": self.school_id,
+            "start_date": self.start_date,
+            "end_date": self.end_date,
+        }
+
+    @staticmethod
+    def _invoice_row(invoice) -> dict:
+        """Shape an invoice row (with paid_amount) for the statement"""
+        paid_amount = invoice.paid_amount
+        return {
+            "invoice_id": invoice.id,
+            "student_id": invoice.student_id,
+            "issue_date": invoice.issue_date,
+            "due_date": invoice.due_date,
+            "status": invoice.status.upper(),
+            "total_amount": invoice.total_amount,
+            "paid_amount": paid_amount,
+            "pending_amount": invoice.total_amount - paid_amount,
+        }
 
     def _build_invoice_rows(self) -> list[dict]:
         """Get invoice breakdown for school (expensive, optional, reusable)
 
         Returns:
             List of invoice dictionaries with paid/pending amounts
-
-        Handles:
-        - Invoice query (joined with students)
-        - Payment aggregation per invoice (no N+1)
-        - Row shaping
         """
-        # Query for invoices with date filters
-        invoices = (
-            self.db.query(Invoice)
-            .join(Student, Invoice.student_id == Student.id)
-            .filter(*self._school_invoice_base_filters())
-            .all()
-        )
-
-        if not invoices:
-            return []
+        rows = self.db.execute(_SCHOOL_INVOICE_ROWS_STMT, self._invoice_rows_params())
+        return [self._invoice_row(row) for row in rows]
 
-        # Single grouped query to get paid amounts for all invoices (no N+1)
-        invoice_ids = [invoice.id for invoice in invoices]
+    def iter_invoice_rows(self) -> Iterator[dict]:
+        """Yield the invoice breakdown row by row from a server-side cursor
 
-        payment_results = (
-            self.db.query(
-                Payment.invoice_id,
-                func.coalesce(func.sum(Payment.amount), 0).label("paid_amount"),
-            )
-            .filter(Payment.invoice_id.in_(invoice_ids), Payment.deleted_at.is_(None))
-            .group_by(Payment.invoice_id)
-            .all()
+        Rows are fetched STREAM_BATCH_SIZE at a time, so memory stays flat for
+        wide date ranges (used for streamed exports).
+        """
+        rows = self.db.execute(
+            _SCHOOL_INVOICE_ROWS_STMT,
+            self._invoice_rows_params(),
+            execution_options={"yield_per": STREAM_BATCH_SIZE},
         )
-
-        # Build a dictionary for O(1) lookup
-        payment_totals = {
-            invoice_id: paid or Decimal("0") for invoice_id, paid in payment_results
-        }
-
-        # Now build invoice items with O(1) lookup per invoice
-        invoice_items = []
-        for invoice in invoices:
-            paid_amount = payment_totals.get(invoice.id, Decimal("0"))
-            pending_amount = invoice.total_amount - paid_amount
-
-            invoice_items.append(
-                {
-                    "invoice_id": invoice.id,
-                    "student_id": invoice.student_id,
-                    "issue_date": invoice.issue_date,
-                    "due_date": invoice.due_date,
-                    "status": invoice.status.upper(),
-                    "total_amount": invoice.total_amount,
-                    "paid_amount": paid_amount,
-                    "pending_amount": pending_amount,
-                }
-            )
-
-        return invoice_items
+        for row in rows:
+            yield self._invoice_row(row)
 
     def get_statement(self):
         """Get account statement for a school (application-level use case)
@@ -183,16 +290,13 @@ class SchoolStatementService:
             f"include_invoices={self.include_invoices}"
         )
 
-        # Validation / existence check
-        result = self._get_school_and_student_count()
+        # Existence check + aggregation (single query)
+        result = self._get_school_totals()
         if not result:
             logger.warning(f"School not found: school_id={self.school_id}")
             return None
 
-        school, student_count = result
-
-        # Aggregation queries
-        total_invoiced, total_paid, total_pending = self._calculate_totals()
+        school_name, student_count, total_invoiced, total_paid, total_pending = result
 
         # Optional detail expansion
         invoice_items = None
@@ -200,16 +304,16 @@ class SchoolStatementService:
             invoice_items = self._build_invoice_rows()
 
         logger.info(
-            f"School statement generated: school_id={school.id}, "
-            f"school_name='{school.name}', student_count={student_count}, "
+            f"School statement generated: school_id={self.school_id}, "
+            f"school_name='{school_name}', student_count={student_count}, "
             f"total_invoiced={total_invoiced}, "
             f"total_paid={total_paid}, total_pending={total_pending}"
         )
 
         # Build and return statement
         return {
-            "school_id": school.id,
-            "school_name": school.name,
+            "school_id": self.school_id,
+            "school_name": school_name,
             "period": {"start_date": self.start_date, "end_date": self.end_date},
             "student_count": student_count,
             "summary": {
@@ -219,3 +323,34 @@ class SchoolStatementService:
             },
             "invoices": invoice_items,
         }
+
+    def _cache_key(self) -> str:
+        """Cache key for this statement under the current namespace version"""
+        version = namespace_version(STATEMENT_NAMESPACE)
+        return (
+            f"{STATEMENT_NAMESPACE}:v{version}:school:{self.school_id}:"
+            f"{self.start_date}:{self.end_date}:{int(self.include_invoices)}"
+        )
+
+    def get_statement_json(self) -> bytes | None:
+        """Get the statement as response-ready JSON, served from the cache when
+        possible
+
+        Returns:
+            JSON (None fields omitted) or None if school not found (misses are
+            not cached)
+        """
+        key = self._cache_key()
+        cached = cache_get(key)
+        if cached is not None:
+            return cached
+
+        statement = self.get_statement()
+        if statement is None:
+            return None
+
+        content = SchoolAccountStatement.from_statement(statement).model_dump_json(
+            exclude_none=True
+        )
+        cache_set(key, content, ttl=STATEMENT_CACHE_TTL_SECONDS)
+        return content.encode()
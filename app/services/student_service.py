@@ -1,21 +1,44 @@
 from datetime import datetime, timezone
+from typing import Optional
 
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session
 
+from app.core.cache import (
+    STATEMENT_NAMESPACE,
+    bump_namespace,
+    cache_delete,
+    cache_get,
+    cache_key,
+    cache_set,
+)
 from app.models.student import Student
-from app.schemas.student import StudentCreate, StudentUpdate
+from app.schemas.student import StudentCreate, StudentRead, StudentUpdate
 
 
 class StudentService:
     @staticmethod
-    def get_all(db: Session, skip: int = 0, limit: int = 100):
-        """Get all students excluding soft-deleted with pagination"""
-        return (
-            db.query(Student)
-            .filter(Student.deleted_at.is_(None))
-            .offset(skip)
-            .limit(limit)
-            .all()
+    def get_all(
+        db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
+    ):
+        """
+        Get all students excluding soft-deleted with pagination
+
+        Pass after_id (keyset pagination) to read the page following that id
+        without scanning and discarding the skipped rows.
+        """
+        query = db.query(Student).filter(Student.deleted_at.is_(None))
+
+        if after_id is not None:
+            query = query.filter(Student.id > after_id)
+
+        return query.order_by(Student.id).offset(skip).limit(limit).all()
+
+    @staticmethod
+    def count(db: Session):
+        """Count students excluding soft-deleted"""
+        return db.scalar(
+            select(func.count()).select_from(Student).where(Student.deleted_at.is_(None))
         )
 
     @staticmethod
@@ -27,27 +50,77 @@ class StudentService:
             .first()
         )
 
+    @staticmethod
+    def get_updated_at(student_id: int, db: Session) -> Optional[datetime]:
+        """Last modification time of an active student (None if it does not exist)
+
+        Reads a single column, so conditional GETs can be answered without
+        loading the student.
+        """
+        return (
+            db.query(Student.updated_at)
+            .filter(Student.id == student_id, Student.deleted_at.is_(None))
+            .scalar()
+        )
+
+    @staticmethod
+    def get_read_by_id(student_id: int, db: Session) -> Optional[StudentRead]:
+        """Get student by ID as StudentRead, served from the cache when possible"""
+        key = cache_key("student", student_id)
+        cached = cache_get(key)
+        if cached is not None:
+            return StudentRead.model_validate_json(cached)
+
+        student = StudentService.get_by_id(student_id, db)
+        if student is None:
+            return None
+
+        student_read = StudentRead.model_validate(student)
+        cache_set(key, student_read.model_dump_json())
+        return student_read
+
     @staticmethod
     def create(student_in: StudentCreate, db: Session):
         """Create a new student"""
         student = Student(**student_in.model_dump())
         db.add(student)
         db.commit()
+        # The school statement counts the school's students
+        bump_namespace(STATEMENT_NAMESPACE)
         db.refresh(student)
         return student
 
     @staticmethod
-    def update(student: Student, student_in: StudentUpdate, db: Session):
-        """Update an existing student"""
-        for field, value in student_in.model_dump(exclude_unset=True).items():
-            setattr(student, field, value)
+    def update_by_id(
+        student_id: int, student_in: StudentUpdate, db: Session
+    ) -> Optional[StudentRead]:
+        """Update a student in a single UPDATE ... RETURNING and return it as
+        StudentRead (None if not found)"""
+        student = db.execute(
+            update(Student)
+            .where(Student.id == student_id, Student.deleted_at.is_(None))
+            .values(**student_in.model_dump(exclude_unset=True))
+            .returning(Student)
+        ).scalar_one_or_none()
+        # Serialized before the commit expires the returned row, so the response
+        # needs no reload
+        student_read = (
+            StudentRead.model_validate(student) if student is not None else None
+        )
         db.commit()
-        db.refresh(student)
-        return student
+        cache_delete(cache_key("student", student_id))
+        bump_namespace(STATEMENT_NAMESPACE)
+        return student_read
 
     @staticmethod
-    def delete(student: Student, db: Session):
-        """Soft delete a student"""
-        student.deleted_at = datetime.now(timezone.utc)
+    def delete_by_id(student_id: int, db: Session):
+        """Soft delete a student in a single UPDATE (False if not found)"""
+        result = db.execute(
+            update(Student)
+            .where(Student.id == student_id, Student.deleted_at.is_(None))
+            .values(deleted_at=datetime.now(timezone.utc))
+        )
         db.commit()
-        return True
+        cache_delete(cache_key("student", student_id))
+        bump_namespace(STATEMENT_NAMESPACE)
+        return result.rowcount > 0
@@ -2,17 +2,95 @@ import logging
 from datetime import date
 from decimal import Decimal
 
-from sqlalchemy import func
+from sqlalchemy import Row, bindparam, func, select
 from sqlalchemy.orm import Session
 
-from app.models.invoice import Invoice
-from app.models.payment import Payment
+from app.core.cache import (
+    STATEMENT_CACHE_TTL_SECONDS,
+    STATEMENT_NAMESPACE,
+    cache_get,
+    cache_set,
+    namespace_version,
+)
+from app.models.invoice import Invoice, InvoiceStatus
 from app.models.school import School
 from app.models.student import Student
+from app.models.types import ZERO_AMOUNT
+from app.schemas.account_statement import StudentAccountStatement
 
 logger = logging.getLogger(__name__)
 
 
+def _student_invoice_filters(student_id, start_date, end_date) -> list:
+    """Filter conditions for a student's statement invoices (values or bindparams)"""
+    return [
+        Invoice.student_id == student_id,
+        Invoice.deleted_at.is_(None),
+        Invoice.status != InvoiceStatus.CANCELLED,
+        Invoice.issue_date >= start_date,
+        Invoice.issue_date <= end_date,
+    ]
+
+
+def _build_totals_stmt():
+    """Student, school and totals in one statement (no row if the student does
+    not exist): the matching invoices are selected once in a CTE and reused for
+    the invoiced and paid aggregates
+
+    Columns: first_name, last_name, school_id, school_name, invoiced, paid
+    """
+    student_invoices = (
+        select(Invoice.total_amount, Invoice.paid_amount)
+        .where(
+            *_student_invoice_filters(
+                bindparam("student_id"), bindparam("start_date"), bindparam("end_date")
+            )
+        )
+        .cte("student_invoices")
+    )
+
+    total_invoiced_query = select(
+        func.coalesce(func.sum(student_invoices.c.total_amount), 0)
+    ).scalar_subquery()
+
+    total_paid_query = select(
+        func.coalesce(func.sum(student_invoices.c.paid_amount), 0)
+    ).scalar_subquery()
+
+    return (
+        select(
+            Student.first_name,
+            Student.last_name,
+            School.id.label("school_id"),
+            School.name.label("school_name"),
+            total_invoiced_query,
+            total_paid_query,
+        )
+        .join(School, School.id == Student.school_id)
+        .where(Student.id == bindparam("student_id"), Student.deleted_at.is_(None))
+    )
+
+
+# Built once at import with bound parameters, so each request only binds values
+# (no per-request statement construction; compiled SQL reused from the engine cache)
+_STUDENT_TOTALS_STMT = _build_totals_stmt()
+
+# Invoice breakdown: only the row columns are selected (covered by the partial
+# index, no full entity hydration); paid_amount is denormalized on the invoice
+_STUDENT_INVOICE_ROWS_STMT = select(
+    Invoice.id,
+    Invoice.issue_date,
+    Invoice.due_date,
+    Invoice.status,
+    Invoice.total_amount,
+    Invoice.paid_amount,
+).where(
+    *_student_invoice_filters(
+        bindparam("student_id"), bindparam("start_date"), bindparam("end_date")
+    )
+)
+
+
 class StudentStatementService:
     """Service for generating student account statements"""
 
@@ -39,126 +117,64 @@ class StudentStatementService:
         self.end_date = end_date
         self.include_invoices = include_invoices
 
-    def _get_student_and_school(self) -> tuple[Student, School] | None:
-        """Fetch student and their school (validation + existence check)
-
-        Returns:
-            Tuple of (student, school) if student exists, None otherwise
-        """
-        student = (
-            self.db.query(Student)
-            .filter(Student.id == self.student_id, Student.deleted_at.is_(None))
-            .first()
-        )
-
-        if not student:
-            return None
-
-        school = self.db.query(School).filter(School.id == student.school_id).first()
+    def _get_student_totals(self) -> tuple[Row, Decimal, Decimal, Decimal] | None:
+        """Fetch the student, their school and the aggregated totals in one round
+        trip (validation + existence check + aggregation)
 
-        return student, school
-
-    def _student_invoice_base_filters(self):
-        """
-        Return common filter conditions for student invoice queries
+        Only the needed student/school columns are selected (school JOINed); both
+        sums come from a CTE of the matching invoices in the same statement.
 
         Returns:
-            List of filter conditions that can be unpacked into .filter()
+            Tuple of (row with first_name, last_name, school_id, school_name;
+            total_invoiced, total_paid, total_pending), or None if the student
+            does not exist
         """
-        return [
-            Invoice.student_id == self.student_id,
-            Invoice.deleted_at.is_(None),
-            Invoice.status != "cancelled",
-            Invoice.issue_date >= self.start_date,
-            Invoice.issue_date <= self.end_date,
-        ]
-
-    def _calculate_totals(self) -> tuple[Decimal, Decimal, Decimal]:
-        """Aggregate totals for student invoices (pure aggregation logic)
-
-        Returns:
-            Tuple of (total_invoiced, total_paid, total_pending)
-        """
-        # SUM(invoice.total_amount) for total_invoiced
-        total_invoiced_result = (
-            self.db.query(func.coalesce(func.sum(Invoice.total_amount), 0))
-            .filter(*self._student_invoice_base_filters())
-            .scalar()
-        )
-
-        total_invoiced: Decimal = total_invoiced_result or Decimal("0")
-
-        # SUM(payment.amount) for total_paid with date filters on invoice issue_date
-        total_paid_result = (
-            self.db.query(func.coalesce(func.sum(Payment.amount), 0))
-            .join(Invoice, Payment.invoice_id == Invoice.id)
-            .filter(*self._student_invoice_base_filters(), Payment.deleted_at.is_(None))
-            .scalar()
-        )
+        row = self.db.execute(
+            _STUDENT_TOTALS_STMT,
+            {
+                "student_id": self.student_id,
+                "start_date": self.start_date,
+                "end_date": self.end_date,
+            },
+        ).first()
+        if row is None:
+            return None
 
-        total_paid: Decimal = total_paid_result or Decimal("0")
+        total_invoiced: Decimal = row[4] or ZERO_AMOUNT
+        total_paid: Decimal = row[5] or ZERO_AMOUNT
         total_pending: Decimal = total_invoiced - total_paid
 
-        return total_invoiced, total_paid, total_pending
+        return row, total_invoiced, total_paid, total_pending
+
+    @staticmethod
+    def _invoice_row(invoice) -> dict:
+        """Shape an invoice row (with paid_amount) for the statement"""
+        paid_amount = invoice.paid_amount
+        return {
+            "invoice_id": invoice.id,
+            "issue_date": invoice.issue_date,
+            "due_date": invoice.due_date,
+            "status": invoice.status.upper(),
+            "total_amount": invoice.total_amount,
+            "paid_amount": paid_amount,
+            "pending_amount": invoice.total_amount - paid_amount,
+        }
 
     def _build_invoice_rows(self) -> list[dict]:
         """Get invoice breakdown for student (expensive, optional, reusable)
 
         Returns:
             List of invoice dictionaries with paid/pending amounts
-
-        Handles:
-        - Invoice query
-        - Payment aggregation per invoice (no N+1)
-        - Row shaping
         """
-        # Query for invoices with date filters
-        invoices = (
-            self.db.query(Invoice)
-            .filter(*self._student_invoice_base_filters())
-            .all()
-        )
-
-        if not invoices:
-            return []
-
-        # Single grouped query to get paid amounts for all invoices (no N+1)
-        invoice_ids = [invoice.id for invoice in invoices]
-
-        payment_results = (
-            self.db.query(
-                Payment.invoice_id,
-                func.coalesce(func.sum(Payment.amount), 0).label("paid_amount"),
-            )
-            .filter(Payment.invoice_id.in_(invoice_ids), Payment.deleted_at.is_(None))
-            .group_by(Payment.invoice_id)
-            .all()
+        rows = self.db.execute(
+            _STUDENT_INVOICE_ROWS_STMT,
+            {
+                "student_id": self.student_id,
+                "start_date": self.start_date,
+                "end_date": self.end_date,
+            },
         )
-
-        # Build a dictionary for O(1) lookup
-        payment_totals = {
-            invoice_id: paid or Decimal("0") for invoice_id, paid in payment_results
-        }
-
-        # Now build invoice items with O(1) lookup per invoice
-        invoice_items = []
-        for invoice in invoices:
-            paid_amount = payment_totals.get(invoice.id, Decimal("0"))
-            pending_amount = invoice.total_amount - paid_amount
-
-            invoice_items.append(
-                {
-                    "invoice_id": invoice.id,
-                    "issue_date": invoice.issue_date,
-                    "due_date": invoice.due_date,
-                    "status": invoice.status.upper(),
-                    "total_amount": invoice.total_amount,
-                    "paid_amount": paid_amount,
-                    "pending_amount": pending_amount,
-                }
-            )
-
-        return invoice_items
+        return [self._invoice_row(row) for row in rows]
 
     def get_statement(self):
         """Get account statement for a student (application-level use case)
@@ -174,16 +190,13 @@ class StudentStatementService:
             f"include_invoices={self.include_invoices}"
         )
 
-        # Validation / existence check
-        result = self._get_student_and_school()
+        # Validation / existence check and aggregation (one round trip)
+        result = self._get_student_totals()
         if not result:
             logger.warning(f"Student not found: student_id={self.student_id}")
             return None
 
-        student, school = result
-
-        # Aggregation queries
-        total_invoiced, total_paid, total_pending = self._calculate_totals()
+        student, total_invoiced, total_paid, total_pending = result
 
         # Optional detail expansion
         invoice_items = None
@@ -191,18 +204,18 @@ class StudentStatementService:
             invoice_items = self._build_invoice_rows()
 
         logger.info(
-            f"Student statement generated: student_id={student.id}, "
-            f"school_id={school.id}, "
+            f"Student statement generated: student_id={self.student_id}, "
+            f"school_id={student.school_id}, "
             f"total_invoiced={total_invoiced}, "
             f"total_paid={total_paid}, total_pending={total_pending}"
         )
 
         # Build and return statement
         return {
-            "student_id": student.id,
+            "student_id": self.student_id,
             "student_name": f"{student.first_name} {student.last_name}",
-            "school_id": school.id,
-            "school_name": school.name,
+            "school_id": student.school_id,
+            "school_name": student.school_name,
             "period": {"start_date": self.start_date, "end_date": self.end_date},
             "summary": {
                 "total_invoiced": total_invoiced,
@@ -211,3 +224,105 @@ class StudentStatementService:
             },
             "invoices": invoice_items,
         }
+
+    def _cache_key(self) -> str:
+        """Cache key for this statement under the current namespace version"""
+        version = namespace_version(STATEMENT_NAMESPACE)
+        return (
+            f"{STATEMENT_NAMESPACE}:v{version}:student:{self.student_id}:"
+            f"{self.start_date}:{self.end_date}:{int(self.include_invoices)}"
+        )
+
+    def get_statement_json(self) -> bytes | None:
+        """Get the statement as response-ready JSON, served from the cache when
+        possible
+
+        Returns:
+            JSON (None fields omitted) or None if student not found (misses are
+            not cached)
+        """
+        key = self._cache_key()
+        cached = cache_get(key)
+        if cached is not None:
+            return cached
+
+        statement = self.get_statement()
+        if statement is None:
+            return None
+
+        content = StudentAccountStatement.from_statement(statement).model_dump_json(
+            exclude_none=True
+        )
+        cache_set(key, content, ttl=STATEMENT_CACHE_TTL_SECONDS)
+        return content.encode()
+
+    @staticmethod
+    def get_statements(
+        student_ids: list[int], db: Session, start_date: date, end_date: date
+    ) -> list[dict]:
+        """Get summary statements (no invoice list) for many students at once
+
+        Students, schools and per-student totals come from a single query: the
+        invoices (with their denormalized paid amounts) are aggregated per student
+        and LEFT JOINed to the students.
+
+        Returns:
+            Statement dicts ordered by student id; unknown or deleted students
+            are omitted
+        """
+        logger.info(
+            f"Generating student statements: count={len(student_ids)}, "
+            f"period={start_date} to {end_date}"
+        )
+
+        invoice_filters = [
+            Invoice.student_id.in_(student_ids),
+            Invoice.deleted_at.is_(None),
+            Invoice.status != InvoiceStatus.CANCELLED,
+            Invoice.issue_date >= start_date,
+            Invoice.issue_date <= end_date,
+        ]
+        student_totals = (
+            select(
+                Invoice.student_id,
+                func.sum(Invoice.total_amount).label("total_invoiced"),
+                func.sum(Invoice.paid_amount).label("total_paid"),
+            )
+            .where(*invoice_filters)
+            .group_by(Invoice.student_id)
+            .subquery()
+        )
+
+        rows = db.execute(
+            select(
+                Student.id,
+                Student.first_name,
+                Student.last_name,
+                School.id.label("school_id"),
+                School.name.label("school_name"),
+                func.coalesce(student_totals.c.total_invoiced, 0).label("total_invoiced"),
+                func.coalesce(student_totals.c.total_paid, 0).label("total_paid"),
+            )
+            .join(School, School.id == Student.school_id)
+            .outerjoin(student_totals, student_totals.c.student_id == Student.id)
+            .where(Student.id.in_(student_ids), Student.deleted_at.is_(None))
+            .order_by(Student.id)
+        ).all()
+
+        period = {"start_date": start_date, "end_date": end_date}
+        return [
+            {
+                "student_id": row.id,
+                "student_name": f"{row.first_name} {row.last_name}",
+                "school_id": row.school_id,
+                "school_name": row.school_name,
+                "period": period,
+                "summary": {
+                    "total_invoiced": row.total_invoiced,
+                    "total_paid": row.total_paid,
+                    "total_pending": row.total_invoiced - row.total_paid,
+                },
+                "invoices": None,
+            }
+            for row in rows
+        ]
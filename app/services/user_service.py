@@ -1,8 +1,8 @@
 from datetime import datetime, timezone
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
 
-from app.core.security import hash_password, verify_password
+from app.core.security import hash_password, password_needs_rehash, verify_password
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 
@@ -50,14 +50,36 @@ class UserService:
         db.refresh(user)
         return user
 
+    @staticmethod
+    def get_credentials_by_email(email: str, db: Session):
+        """
+        Get user by email excluding soft-deleted, loading only the columns needed
+        to verify credentials (served by the covering ix_users_email_active index)
+        """
+        return (
+            db.query(User)
+            .options(
+                load_only(
+                    User.id, User.email, User.hashed_password, User.role, User.is_active
+                )
+            )
+            .filter(User.email == email, User.deleted_at.is_(None))
+            .first()
+        )
+
     @staticmethod
     def authenticate(email: str, password: str, db: Session):
         """Authenticate user with email and password"""
-        user = UserService.get_by_email(email, db)
+        user = UserService.get_credentials_by_email(email, db)
         if not user:
             return None
         if not verify_password(password, user.hashed_password):
             return None
+
+        # Lazily migrate legacy bcrypt hashes now that the plain password is known
+        if password_needs_rehash(user.hashed_password):
+            user.hashed_password = hash_password(password)
+            db.commit()
         return user
 
     @staticmethod
@@ -3,10 +3,11 @@ from decimal import Decimal
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
-from app.core.auth import get_current_user
+from app.core import cache
+from app.core.auth import clear_user_cache, get_current_user
 from app.core.database import Base, get_db
 from app.main import app
 from app.models.user import User, UserRole
@@ -39,6 +40,49 @@ def db():
     finally:
         db.close()
         Base.metadata.drop_all(bind=engine)
+        clear_user_cache()
+
+
+class FakeRedis:
+    """In-memory stand-in for the few Redis commands app.core.cache uses"""
+
+    def __init__(self):
+        self.store: dict[str, bytes] = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value.encode() if isinstance(value, str) else value
+
+    def delete(self, *keys):
+        return sum(self.store.pop(key, None) is not None for key in keys)
+
+    def incr(self, key):
+        value = int(self.store.get(key, b"0")) + 1
+        self.store[key] = str(value).encode()
+        return value
+
+
+@pytest.fixture(scope="function")
+def fake_redis(monkeypatch):
+    """Enable the Redis cache layer, backed by an in-memory fake"""
+    fake = FakeRedis()
+    monkeypatch.setattr(cache, "_client", fake)
+    return fake
+
+
+@pytest.fixture(scope="function")
+def sql_statements():
+    """SQL statements executed on the test engine while the test runs"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
 
 
 @pytest.fixture(scope="function")
@@ -0,0 +1,186 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from types import SimpleNamespace
+
+import jwt
+import pytest
+
+from app.core import auth
+from app.core.cache import bump_namespace
+from app.core.security import create_access_token
+from app.models.user import User
+from app.services.user_service import UserService
+
+
+@pytest.fixture
+def token(test_user):
+    """Access token for the test user"""
+    return create_access_token({"sub": test_user.email})
+
+
+@pytest.fixture
+def user_lookups(monkeypatch, test_user):
+    """Count user queries, answering them with a detached copy of the test user"""
+    fields = {name: getattr(test_user, name) for name in auth._CACHED_USER_FIELDS}
+    calls = []
+
+    def get_by_email(email, db):
+        calls.append(email)
+        return User(**fields)
+
+    monkeypatch.setattr(UserService, "get_by_email", staticmethod(get_by_email))
+    return calls
+
+
+def test_resolve_user_cache_hit_skips_query(db, token, user_lookups):
+    """A second request with the same token is served from the cache"""
+    first = auth._resolve_user(token, db)
+    second = auth._resolve_user(token, db)
+
+    assert first.email == second.email == "testuser@example.com"
+    assert len(user_lookups) == 1
+
+
+def test_cached_user_never_outlives_token(db, test_user, user_lookups, monkeypatch):
+    """Cache entries expire with the token's exp claim, before the cache TTL"""
+    token = create_access_token({"sub": test_user.email}, timedelta(seconds=5))
+    expires_at = jwt.decode(token, options={"verify_signature": False})["exp"]
+    auth._resolve_user(token, db)
+    token_key = auth._token_key(token)
+    assert auth._get_cached_user(token_key) is not None
+
+    monkeypatch.setattr(auth, "time", SimpleNamespace(time=lambda: expires_at))
+
+    assert auth._get_cached_user(token_key) is None
+
+
+def test_invalidate_cached_user_forces_reload(db, token, user_lookups):
+    """Invalidation drops every cached resolution of the user"""
+    auth._resolve_user(token, db)
+    auth.invalidate_cached_user("testuser@example.com")
+
+    assert auth._get_cached_user(auth._token_key(token)) is None
+    auth._resolve_user(token, db)
+    assert len(user_lookups) == 2
+
+
+def test_invalidation_in_another_worker_applies(db, token, user_lookups, fake_redis):
+    """A shared generation bump (from any process) invalidates local entries"""
+    auth._resolve_user(token, db)
+    assert auth._get_cached_user(auth._token_key(token)) is not None
+
+    # What invalidate_cached_user does in another worker, seen from this one
+    bump_namespace(auth._user_namespace("testuser@example.com"))
+
+    assert auth._get_cached_user(auth._token_key(token)) is None
+    auth._resolve_user(token, db)
+    assert len(user_lookups) == 2
+
+
+def test_load_racing_a_write_is_not_served(db, token, monkeypatch, test_user):
+    """A row read before a concurrent write commits is never served afterwards"""
+    fields = {name: getattr(test_user, name) for name in auth._CACHED_USER_FIELDS}
+
+    def get_by_email(email, db):
+        stale = User(**fields)
+        # The write commits while this lookup is still in flight
+        auth.invalidate_cached_user(email)
+        return stale
+
+    monkeypatch.setattr(UserService, "get_by_email", staticmethod(get_by_email))
+
+    assert auth._resolve_user(token, db) is not None
+    assert auth._get_cached_user(auth._token_key(token)) is None
+
+
+def test_concurrent_misses_are_coalesced(db, token, user_lookups, monkeypatch):
+    """A burst of requests with an uncached token issues a single user query"""
+    get_by_email = UserService.get_by_email
+    started = threading.Event()
+
+    def slow_get_by_email(email, db):
+        started.set()
+        time.sleep(0.05)
+        return get_by_email(email, db)
+
+    monkeypatch.setattr(UserService, "get_by_email", staticmethod(slow_get_by_email))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        users = list(pool.map(lambda _: auth._resolve_user(token, db), range(8)))
+
+    assert started.is_set()
+    assert all(user.email == "testuser@example.com" for user in users)
+    assert len(user_lookups) == 1
+    assert auth._inflight_tokens == {}
+
+
+def test_back_to_back_bursts_are_each_coalesced(db, token, user_lookups, monkeypatch):
+    """Coalescing keeps working for a second burst after the first one ends"""
+    get_by_email = UserService.get_by_email
+
+    def slow_get_by_email(email, db):
+        time.sleep(0.05)
+        return get_by_email(email, db)
+
+    monkeypatch.setattr(UserService, "get_by_email", staticmethod(slow_get_by_email))
+
+    for burst in (1, 2):
+        auth.invalidate_cached_user("testuser@example.com")
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: auth._resolve_user(token, db), range(8)))
+        assert len(user_lookups) == burst
+        assert auth._inflight_tokens == {}
+
+
+def test_waiter_keeps_a_newer_bursts_lock(db, token, user_lookups, monkeypatch):
+    """A waiter finishing after a new burst started must not remove its lock"""
+    token_key = auth._token_key(token)
+    get_by_email = UserService.get_by_email
+    release_loader = threading.Event()
+    waiter_checked = threading.Event()
+    resume_waiter = threading.Event()
+    get_cached_user = auth._get_cached_user
+    waiter_calls = []
+
+    def blocking_get_by_email(email, db):
+        release_loader.wait(5)
+        return get_by_email(email, db)
+
+    def pausing_get_cached_user(key):
+        if threading.current_thread().name == "waiter":
+            waiter_calls.append(key)
+            if len(waiter_calls) == 1:
+                waiter_checked.set()
+            else:
+                # Holding the first burst's lock, about to return
+                resume_waiter.wait(5)
+        return get_cached_user(key)
+
+    monkeypatch.setattr(UserService, "get_by_email", staticmethod(blocking_get_by_email))
+    monkeypatch.setattr(auth, "_get_cached_user", pausing_get_cached_user)
+
+    def resolve():
+        auth._resolve_user(token, db)
+
+    loader = threading.Thread(target=resolve, name="loader")
+    loader.start()
+    while token_key not in auth._inflight_tokens:
+        time.sleep(0.001)
+    waiter = threading.Thread(target=resolve, name="waiter")
+    waiter.start()
+    waiter_checked.wait(5)
+    time.sleep(0.02)  # let the waiter block on the loader's lock
+
+    release_loader.set()
+    loader.join(5)
+    # A new burst installs its own lock before the waiter finishes
+    newer_lock = threading.Lock()
+    auth._inflight_tokens[token_key] = newer_lock
+    resume_waiter.set()
+    waiter.join(5)
+
+    assert auth._inflight_tokens.get(token_key) is newer_lock
+    assert len(user_lookups) == 1
+    auth._inflight_tokens.pop(token_key, None)
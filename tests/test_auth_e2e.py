@@ -237,3 +237,129 @@ def test_jwt_token_contains_user_email(client, test_user):
     decoded = json.loads(base64.b64decode(payload))
     assert decoded["sub"] == test_user.email
     assert "exp" in decoded  # Should have expiration
+
+
+def _real_auth_client(db):
+    """Test client that authenticates through the real token dependency"""
+    from fastapi.testclient import TestClient
+
+    from app.core.database import get_db
+    from app.main import app
+
+    app.dependency_overrides.clear()
+    app.dependency_overrides[get_db] = lambda: db
+    return TestClient(app)
+
+
+def _login(client, email, password="testpassword123"):
+    response = client.post(
+        "/api/v1/auth/login", data={"username": email, "password": password}
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_deactivated_user_rejected_on_next_request(client, test_user, db):
+    """Deactivating a user takes effect despite a cached token resolution"""
+    real_client = _real_auth_client(db)
+    headers = _login(real_client, test_user.email)
+    assert real_client.get("/api/v1/auth/me", headers=headers).status_code == 200
+
+    test_user.is_active = 0
+    db.commit()
+
+    response = real_client.get("/api/v1/auth/me", headers=headers)
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Inactive user"
+
+
+def test_demoted_admin_loses_admin_access_on_next_request(client, test_user, db):
+    """Demoting an admin takes effect despite a cached token resolution"""
+    from app.models.user import UserRole
+
+    test_user.role = UserRole.ADMIN
+    db.commit()
+    real_client = _real_auth_client(db)
+    headers = _login(real_client, test_user.email)
+    school = {
+        "name": "Admin School",
+        "contact_email": "admin@school.com",
+        "contact_phone": "+1234567890",
+    }
+    response = real_client.post("/api/v1/schools/", json=school, headers=headers)
+    assert response.status_code == 201
+
+    test_user.role = UserRole.USER
+    db.commit()
+
+    response = real_client.post("/api/v1/schools/", json=school, headers=headers)
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Admin access required"
+
+
+def test_rolled_back_user_write_keeps_cached_resolution(client, test_user, db):
+    """Only committed writes invalidate the cached user"""
+    from app.core import auth
+
+    real_client = _real_auth_client(db)
+    headers = _login(real_client, test_user.email)
+    assert real_client.get("/api/v1/auth/me", headers=headers).status_code == 200
+
+    test_user.full_name = "Never Committed"
+    db.flush()
+    db.rollback()
+
+    assert auth._user_versions.get(test_user.email, 0) == 0
+    assert real_client.get("/api/v1/auth/me", headers=headers).status_code == 200
+
+
+def _seed_legacy_bcrypt_user(db):
+    """User whose password hash predates the argon2 switch (raw bcrypt)"""
+    import bcrypt
+
+    from app.models.user import User
+
+    user = User(
+        email="legacy@example.com",
+        hashed_password=bcrypt.hashpw(b"legacypassword", bcrypt.gensalt()).decode(),
+        full_name="Legacy User",
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+def test_login_rehashes_legacy_bcrypt_password(client, db):
+    """Test a successful login migrates a legacy bcrypt hash to argon2id"""
+    user = _seed_legacy_bcrypt_user(db)
+    assert user.hashed_password.startswith("$2b$")
+
+    response = client.post(
+        "/api/v1/auth/login",
+        data={"username": "legacy@example.com", "password": "legacypassword"},
+    )
+
+    assert response.status_code == 200
+    db.refresh(user)
+    assert user.hashed_password.startswith("$argon2id$")
+
+    # The migrated hash keeps accepting the same password
+    response = client.post(
+        "/api/v1/auth/login",
+        data={"username": "legacy@example.com", "password": "legacypassword"},
+    )
+    assert response.status_code == 200
+
+
+def test_failed_login_keeps_legacy_bcrypt_password(client, db):
+    """Test a wrong password never rehashes the stored bcrypt hash"""
+    user = _seed_legacy_bcrypt_user(db)
+    legacy_hash = user.hashed_password
+
+    response = client.post(
+        "/api/v1/auth/login",
+        data={"username": "legacy@example.com", "password": "wrongpassword"},
+    )
+
+    assert response.status_code == 401
+    db.refresh(user)
+    assert user.hashed_password == legacy_hash
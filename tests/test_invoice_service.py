@@ -1,7 +1,9 @@
 from datetime import date
 from decimal import Decimal
 
-from app.models.invoice import InvoiceStatus
+from sqlalchemy import update
+
+from app.models.invoice import Invoice, InvoiceStatus
 from app.schemas.invoice import InvoiceCreate, InvoiceItemCreate, InvoiceUpdate
 from app.services.invoice_service import InvoiceService
 
@@ -95,14 +97,14 @@ def test_get_invoice_by_id(db, test_invoice):
 def test_update_invoice(db, test_invoice):
     """Test updating an invoice"""
     update_data = InvoiceUpdate(due_date=date(2024, 3, 15))
-    updated_invoice = InvoiceService.update(test_invoice, update_data, db)
+    updated_invoice = InvoiceService.update_by_id(test_invoice.id, update_data, db)
 
     assert updated_invoice.due_date == date(2024, 3, 15)
 
 
 def test_cancel_invoice(db, test_invoice):
     """Test cancelling an invoice"""
-    cancelled_invoice = InvoiceService.cancel(test_invoice, db)
+    cancelled_invoice = InvoiceService.cancel_by_id(test_invoice.id, db)
 
     assert cancelled_invoice.status == InvoiceStatus.CANCELLED
 
@@ -144,7 +146,7 @@ def test_update_item_recalculates_total(db, invoice_factory, test_student):
     updated_item_data = InvoiceItemCreate(
         description="Updated Item", quantity=3, unit_price=Decimal("200.00")
     )
-    InvoiceService.update_item(item_to_update, updated_item_data, db)
+    InvoiceService.update_item_by_id(invoice.id, item_to_update.id, updated_item_data, db)
 
     # Refresh invoice and check total
     db.refresh(invoice)
@@ -169,7 +171,7 @@ def test_delete_item_recalculates_total(db, invoice_factory, test_student):
 
     # Delete the first item
     item_to_delete = invoice.items[0]
-    InvoiceService.delete_item(item_to_delete, db)
+    InvoiceService.delete_item_by_id(invoice.id, item_to_delete.id, db)
 
     # Refresh invoice and check total
     db.refresh(invoice)
@@ -181,9 +183,9 @@ def test_cannot_delete_last_item(db, test_invoice):
 
     # Try to delete the only item
     item = test_invoice.items[0]
-    result = InvoiceService.delete_item(item, db)
+    result = InvoiceService.delete_item_by_id(test_invoice.id, item.id, db)
 
-    assert result is None  # Should return None (deletion not allowed)
+    assert result is False  # Deletion not allowed
 
     # Invoice should still have the item
     db.refresh(test_invoice)
@@ -191,8 +193,8 @@ def test_cannot_delete_last_item(db, test_invoice):
     assert len(active_items) == 1
 
 
-def test_recalculate_total_excludes_deleted_items(db, invoice_factory, test_student):
-    """Test that recalculate_total excludes soft-deleted items"""
+def test_total_excludes_deleted_items(db, invoice_factory, test_student):
+    """Test that the recalculated total excludes soft-deleted items"""
     invoice = invoice_factory(
         test_student.id,
         items=[
@@ -212,8 +214,43 @@ def test_recalculate_total_excludes_deleted_items(db, invoice_factory, test_stud
 
     # Delete the middle item
     item_to_delete = invoice.items[1]
-    InvoiceService.delete_item(item_to_delete, db)
+    InvoiceService.delete_item_by_id(invoice.id, item_to_delete.id, db)
 
     # Total should now be 100 + 25 = 125 (excluding the deleted 50)
     db.refresh(invoice)
     assert invoice.total_amount == Decimal("125.00")
+
+
+def test_get_read_by_id_cached_until_write(db, test_invoice, fake_redis):
+    """Test the cached invoice read is served until a service write invalidates it"""
+    first = InvoiceService.get_read_by_id(test_invoice.id, db)
+    assert f"invoice:{test_invoice.id}" in fake_redis.store
+
+    # Served from the cache: a change made behind the service's back is not seen
+    db.execute(
+        update(Invoice)
+        .where(Invoice.id == test_invoice.id)
+        .values(due_date=date(2024, 3, 1))
+    )
+    db.commit()
+    assert InvoiceService.get_read_by_id(test_invoice.id, db).due_date == first.due_date
+
+    InvoiceService.update_by_id(
+        test_invoice.id, InvoiceUpdate(due_date=date(2024, 3, 15)), db
+    )
+    assert InvoiceService.get_read_by_id(test_invoice.id, db).due_date == date(
+        2024, 3, 15
+    )
+
+    InvoiceService.add_item(
+        test_invoice,
+        InvoiceItemCreate(description="Books", quantity=1, unit_price=Decimal("50.00")),
+        db,
+    )
+    cached = InvoiceService.get_read_by_id(test_invoice.id, db)
+    assert cached.total_amount == Decimal("1050.00")
+    assert len(cached.items) == 2
+
+    InvoiceService.cancel_by_id(test_invoice.id, db)
+    cancelled = InvoiceService.get_read_by_id(test_invoice.id, db)
+    assert cancelled.status == InvoiceStatus.CANCELLED
@@ -1,3 +1,6 @@
+from datetime import datetime
+
+
 def create_test_student(client):
     """Helper to create a test student"""
     school_response = client.post(
@@ -79,6 +82,34 @@ def test_list_invoices_endpoint(client):
     assert len(data) == 2
 
 
+def test_list_invoices_streamed_cursor_pagination(client):
+    """Test GET /api/v1/invoices/ streams pages and exposes X-Next-Cursor"""
+    student = create_test_student(client)
+    for price in ("100.00", "200.00", "300.00"):
+        client.post(
+            "/api/v1/invoices/",
+            json={
+                "student_id": student["id"],
+                "issue_date": "2024-01-20",
+                "due_date": "2024-02-20",
+                "items": [{"description": "Item", "quantity": 1, "unit_price": price}],
+            },
+        )
+
+    first_page = client.get("/api/v1/invoices/?limit=2")
+    assert first_page.status_code == 200
+    assert [i["total_amount"] for i in first_page.json()] == ["100.00", "200.00"]
+    assert len(first_page.json()[0]["items"]) == 1
+    cursor = first_page.headers["X-Next-Cursor"]
+
+    second_page = client.get(f"/api/v1/invoices/?limit=2&cursor={cursor}")
+    assert [i["total_amount"] for i in second_page.json()] == ["300.00"]
+    assert "X-Next-Cursor" not in second_page.headers
+
+    empty_page = client.get("/api/v1/invoices/?status=paid")
+    assert empty_page.json() == []
+
+
 def test_get_invoice_by_id_endpoint(client):
     """Test GET /api/v1/invoices/{invoice_id}"""
     student = create_test_student(client)
@@ -101,6 +132,49 @@ def test_get_invoice_by_id_endpoint(client):
     assert data["id"] == invoice_id
 
 
+def test_get_invoice_conditional_etag(client, db, test_invoice):
+    """Test GET /api/v1/invoices/{invoice_id} answers If-None-Match with 304"""
+    # SQLite timestamps have one-second resolution: backdate so writes below
+    # necessarily move updated_at
+    test_invoice.updated_at = datetime(2024, 1, 1, 12, 0, 0)
+    db.commit()
+    url = f"/api/v1/invoices/{test_invoice.id}"
+
+    etag = client.get(url).headers["ETag"]
+    assert etag == f'W/"{test_invoice.id}-20240101120000000000"'
+    not_modified = client.get(url, headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == etag
+
+    # A payment changes the invoice, so the old tag no longer matches
+    client.post(
+        f"{url}/payments",
+        json={"payment_date": "2024-01-25", "amount": "100.00", "payment_method": "cash"},
+    )
+    after_payment = client.get(url, headers={"If-None-Match": etag})
+    assert after_payment.status_code == 200
+    assert after_payment.json()["paid_amount"] == "100.00"
+    assert after_payment.headers["ETag"] != etag
+
+
+def test_get_invoice_etag_changes_after_item_update(client, db, test_invoice):
+    """Test an item PATCH invalidates the invoice's ETag"""
+    test_invoice.updated_at = datetime(2024, 1, 1, 12, 0, 0)
+    db.commit()
+    url = f"/api/v1/invoices/{test_invoice.id}"
+    etag = client.get(url).headers["ETag"]
+
+    client.patch(
+        f"{url}/items/{test_invoice.items[0].id}",
+        json={"description": "Tuition", "quantity": 2, "unit_price": "1000.00"},
+    )
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["total_amount"] == "2000.00"
+    assert response.headers["ETag"] != etag
+
+
 def test_update_invoice_endpoint(client):
     """Test PUT /api/v1/invoices/{invoice_id}"""
     student = create_test_student(client)
@@ -125,6 +199,27 @@ def test_update_invoice_endpoint(client):
     assert data["due_date"] == "2024-03-15"
 
 
+def test_update_invoice_does_not_reload_after_commit(
+    client, test_invoice, sql_statements
+):
+    """Test PUT /api/v1/invoices/{invoice_id} is an UPDATE plus one items SELECT"""
+    url = f"/api/v1/invoices/{test_invoice.id}"
+    sql_statements.clear()
+    response = client.put(url, json={"due_date": "2024-03-15"})
+
+    assert response.status_code == 200
+    assert response.json()["due_date"] == "2024-03-15"
+    assert len(response.json()["items"]) == 1
+    assert [sql.split()[0] for sql in sql_statements] == ["UPDATE", "SELECT"]
+    assert "FROM invoice_items" in sql_statements[1]
+
+    sql_statements.clear()
+    response = client.post(f"{url}/cancel")
+
+    assert response.json()["status"] == "cancelled"
+    assert [sql.split()[0] for sql in sql_statements] == ["UPDATE", "SELECT"]
+
+
 def test_cancel_invoice_endpoint(client):
     """Test POST /api/v1/invoices/{invoice_id}/cancel"""
     student = create_test_student(client)
@@ -180,6 +275,46 @@ def test_add_item_to_invoice_endpoint(client):
     assert invoice_response.json()["total_amount"] == "200.00"  # 100 + 100
 
 
+def test_add_items_in_bulk_endpoint(client):
+    """Test POST /api/v1/invoices/{invoice_id}/items/bulk"""
+    student = create_test_student(client)
+
+    create_response = client.post(
+        "/api/v1/invoices/",
+        json={
+            "student_id": student["id"],
+            "issue_date": "2024-01-20",
+            "due_date": "2024-02-20",
+            "items": [
+                {"description": "Original Item", "quantity": 1, "unit_price": "100.00"}
+            ],
+        },
+    )
+    invoice_id = create_response.json()["id"]
+
+    response = client.post(
+        f"/api/v1/invoices/{invoice_id}/items/bulk",
+        json={
+            "items": [
+                {"description": "Books", "quantity": 2, "unit_price": "50.00"},
+                {"description": "Trip", "quantity": 1, "unit_price": "25.50"},
+            ]
+        },
+    )
+
+    assert response.status_code == 201
+    data = response.json()
+    assert [i["description"] for i in data] == ["Books", "Trip"]
+    assert [i["total_amount"] for i in data] == ["100.00", "25.50"]
+
+    invoice_response = client.get(f"/api/v1/invoices/{invoice_id}")
+    assert invoice_response.json()["total_amount"] == "225.50"
+    assert len(invoice_response.json()["items"]) == 3
+
+    empty = client.post(f"/api/v1/invoices/{invoice_id}/items/bulk", json={"items": []})
+    assert empty.status_code == 422
+
+
 def test_update_item_in_invoice_endpoint(client):
     """Test PATCH /api/v1/invoices/{invoice_id}/items/{item_id}"""
     student = create_test_student(client)
@@ -5,6 +5,7 @@ import pytest
 
 from app.models.invoice import InvoiceStatus
 from app.schemas.payment import PaymentCreate
+from app.services.invoice_service import InvoiceService
 from app.services.payment_service import PaymentService
 
 
@@ -21,7 +22,7 @@ def test_create_payment(db, test_invoice):
     assert payment.invoice_id == test_invoice.id
     assert payment.amount == Decimal("500.00")
     assert payment.payment_method == "cash"
-    assert payment.deleted_at is None
+    assert payment.is_deleted is False
 
 
 def test_full_payment_updates_invoice_status(db, test_invoice):
@@ -82,6 +83,25 @@ def test_multiple_payments_to_full_amount_updates_status(db, test_invoice):
     assert test_invoice.status == InvoiceStatus.PAID
 
 
+def test_payments_accumulate_invoice_paid_amount(db, test_invoice):
+    """Test that each payment adds its amount to the invoice's paid_amount"""
+    assert test_invoice.paid_amount == Decimal("0")
+
+    for amount in ("300.00", "200.00"):
+        PaymentService.create(
+            test_invoice,
+            PaymentCreate(
+                payment_date=date(2024, 1, 25),
+                amount=Decimal(amount),
+                payment_method="cash",
+            ),
+            db,
+        )
+
+    db.refresh(test_invoice)
+    assert test_invoice.paid_amount == Decimal("500.00")
+
+
 def test_cannot_overpay_invoice(db, test_invoice):
     """Test that you cannot overpay an invoice"""
 
@@ -118,6 +138,43 @@ def test_cannot_overpay_with_multiple_payments(db, test_invoice):
         PaymentService.create(test_invoice, payment_data, db)
 
 
+def test_cannot_overpay_from_stale_invoice(db, test_invoice):
+    """Test the overpayment check uses the paid amount at write time, not the
+    one loaded with the invoice (as with two concurrent requests)"""
+    from app.models.invoice import Invoice
+    from tests.conftest import TestingSessionLocal
+
+    other_db = TestingSessionLocal()
+    try:
+        # Both requests load the unpaid invoice before either one pays
+        stale_invoice = other_db.get(Invoice, test_invoice.id)
+        assert stale_invoice.paid_amount == 0
+
+        PaymentService.create(
+            test_invoice,
+            PaymentCreate(
+                payment_date=date(2024, 1, 25),
+                amount=Decimal("800.00"),
+                payment_method="cash",
+            ),
+            db,
+        )
+
+        payment_data = PaymentCreate(
+            payment_date=date(2024, 1, 25),
+            amount=Decimal("300.00"),
+            payment_method="cash",
+        )
+        with pytest.raises(ValueError, match="Remaining amount: 200.00"):
+            PaymentService.create(stale_invoice, payment_data, other_db)
+    finally:
+        other_db.close()
+
+    db.refresh(test_invoice)
+    assert test_invoice.paid_amount == Decimal("800.00")
+    assert len(PaymentService.get_by_invoice(test_invoice.id, db)) == 1
+
+
 def test_error_message_shows_remaining_amount(db, test_invoice):
     """Test that error message shows the remaining amount"""
     # Make a partial payment
@@ -178,3 +235,21 @@ def test_get_payment_by_id(db, test_payment):
     assert retrieved_payment is not None
     assert retrieved_payment.id == test_payment.id
     assert retrieved_payment.invoice_id == test_payment.invoice_id
+
+
+def test_get_reads_by_invoice_cached_until_payment(db, test_invoice, fake_redis):
+    """Test the cached payment list (and invoice read) is invalidated by a payment"""
+    assert PaymentService.get_reads_by_invoice(test_invoice.id, db) == []
+    assert InvoiceService.get_read_by_id(test_invoice.id, db).paid_amount == 0
+    assert f"payments:{test_invoice.id}" in fake_redis.store
+
+    payment_data = PaymentCreate(
+        payment_date=date(2024, 1, 25), amount=Decimal("1000.00"), payment_method="cash"
+    )
+    payment = PaymentService.create(test_invoice, payment_data, db)
+
+    payments = PaymentService.get_reads_by_invoice(test_invoice.id, db)
+    assert [p.id for p in payments] == [payment.id]
+    invoice = InvoiceService.get_read_by_id(test_invoice.id, db)
+    assert invoice.paid_amount == Decimal("1000.00")
+    assert invoice.status == InvoiceStatus.PAID
@@ -81,6 +81,7 @@ def test_partial_payment_keeps_pending_status_endpoint(client):
     # Check invoice status is still pending
     invoice_response = client.get(f"/api/v1/invoices/{invoice['id']}")
     assert invoice_response.json()["status"] == "pending"
+    assert invoice_response.json()["paid_amount"] == "500.00"
 
 
 def test_multiple_payments_to_full_amount_endpoint(client):
@@ -78,7 +78,7 @@ def test_update_school(db):
     )
 
     update_data = SchoolUpdate(name="Updated Name", contact_email="updated@test.com")
-    updated_school = SchoolService.update(school, update_data, db)
+    updated_school = SchoolService.update_by_id(school.id, update_data, db)
 
     assert updated_school.name == "Updated Name"
     assert updated_school.contact_email == "updated@test.com"
@@ -94,7 +94,7 @@ def test_soft_delete_school(db):
         db,
     )
 
-    SchoolService.delete(school, db)
+    SchoolService.delete_by_id(school.id, db)
 
     # Should not be returned by get_by_id
     retrieved_school = SchoolService.get_by_id(school.id, db)
@@ -130,9 +130,21 @@ def test_get_all_excludes_soft_deleted(db):
     )
 
     # Soft delete school2
-    SchoolService.delete(school2, db)
+    SchoolService.delete_by_id(school2.id, db)
 
     # get_all should only return school1
     schools = SchoolService.get_all(db)
     assert len(schools) == 1
     assert schools[0].id == school1.id
+
+
+def test_get_read_by_id_cached_until_write(db, test_school, fake_redis):
+    """Test the cached school read is served until a service write invalidates it"""
+    assert SchoolService.get_read_by_id(test_school.id, db).name == "Test School"
+    assert f"school:{test_school.id}" in fake_redis.store
+
+    SchoolService.update_by_id(test_school.id, SchoolUpdate(name="Renamed"), db)
+    assert SchoolService.get_read_by_id(test_school.id, db).name == "Renamed"
+
+    SchoolService.delete_by_id(test_school.id, db)
+    assert SchoolService.get_read_by_id(test_school.id, db) is None
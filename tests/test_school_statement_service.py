@@ -1,9 +1,18 @@
+import json
 from datetime import date
 from decimal import Decimal
 
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from app.core.config import settings
+from app.models.school_monthly_statement import school_monthly_statement
 from app.schemas.invoice import InvoiceItemCreate
 from app.services.invoice_service import InvoiceService
-from app.services.school_statement_service import SchoolStatementService
+from app.services.school_statement_service import (
+    _SCHOOL_TOTALS_WITH_VIEW_STMT,
+    SchoolStatementService,
+)
 
 
 def test_school_statement_basic(
@@ -102,7 +111,7 @@ def test_school_statement_excludes_cancelled_invoices(
     )
 
     # Cancel the first invoice
-    InvoiceService.cancel(invoice1, db)
+    InvoiceService.cancel_by_id(invoice1.id, db)
 
     service = SchoolStatementService(
         school_id=test_school.id,
@@ -126,3 +135,149 @@ def test_school_statement_nonexistent_school(db):
     statement = service.get_statement()
 
     assert statement is None
+
+
+def test_school_statement_view_months(db):
+    """Test which whole elapsed months can be served from the monthly view"""
+
+    def view_months(start_date, end_date):
+        return SchoolStatementService(
+            school_id=1, db=db, start_date=start_date, end_date=end_date
+        )._view_months()
+
+    assert view_months(date(2024, 1, 1), date(2024, 3, 31)) == (
+        date(2024, 1, 1),
+        date(2024, 4, 1),
+    )
+    assert view_months(date(2024, 1, 15), date(2024, 4, 10)) == (
+        date(2024, 2, 1),
+        date(2024, 4, 1),
+    )
+    assert view_months(date(2024, 1, 2), date(2024, 2, 28)) is None
+
+    # The current month is never served from the view
+    this_month = date.today().replace(day=1)
+    assert view_months(this_month, date(this_month.year + 1, 1, 1)) is None
+
+
+def test_school_totals_with_view_compiles_for_postgresql():
+    """Test the monthly view statement compiles for the production dialect"""
+    sql = str(_SCHOOL_TOTALS_WITH_VIEW_STMT.compile(dialect=postgresql.dialect()))
+
+    assert "WITH school_invoices AS" in sql
+    assert "FROM school_monthly_statement" in sql
+    assert "school_monthly_statement.month >= %(first_month)s" in sql
+    assert "school_monthly_statement.month < %(end_month)s" in sql
+    assert "invoices.issue_date < %(first_month)s" in sql
+    assert "invoices.issue_date >= %(end_month)s" in sql
+
+
+# SQLite stand-in for the materialized view (same aggregation as the migration)
+_POPULATE_MONTHLY_STATEMENT = text(
+    """
+    INSERT INTO school_monthly_statement
+        (school_id, month, total_invoiced, total_paid)
+    SELECT
+        s.school_id,
+        strftime('%Y-%m-01', i.issue_date),
+        SUM(i.total_amount),
+        COALESCE(SUM(p.paid), 0)
+    FROM invoices i
+    JOIN students s ON s.id = i.student_id
+    LEFT JOIN (
+        SELECT invoice_id, SUM(amount) AS paid
+        FROM payments
+        WHERE NOT is_deleted
+        GROUP BY invoice_id
+    ) p ON p.invoice_id = i.id
+    WHERE s.deleted_at IS NULL
+      AND i.deleted_at IS NULL
+      AND i.status != 3
+    GROUP BY s.school_id, strftime('%Y-%m-01', i.issue_date)
+"""
+)
+
+
+def test_school_totals_with_view_match_live_totals(
+    db, test_school, test_student, invoice_factory, payment_factory, monkeypatch
+):
+    """Test view months plus the live residual days equal the live-only totals"""
+
+    def items(amount):
+        return [InvoiceItemCreate(description="Tuition", quantity=1, unit_price=amount)]
+
+    # Residual (partial month) at the start of the range
+    invoice_factory(
+        test_student.id, issue_date=date(2024, 1, 15), items=items(Decimal("100.00"))
+    )
+    # Whole months, served from the view
+    february = invoice_factory(
+        test_student.id, issue_date=date(2024, 2, 10), items=items(Decimal("200.00"))
+    )
+    payment_factory(february, amount=Decimal("150.00"))
+    cancelled = invoice_factory(
+        test_student.id, issue_date=date(2024, 2, 20), items=items(Decimal("999.00"))
+    )
+    InvoiceService.cancel_by_id(cancelled.id, db)
+    invoice_factory(
+        test_student.id, issue_date=date(2024, 3, 5), items=items(Decimal("300.00"))
+    )
+    # Residual at the end of the range, and an invoice outside it
+    invoice_factory(
+        test_student.id, issue_date=date(2024, 4, 20), items=items(Decimal("400.00"))
+    )
+    invoice_factory(
+        test_student.id, issue_date=date(2024, 5, 1), items=items(Decimal("500.00"))
+    )
+
+    service = SchoolStatementService(
+        school_id=test_school.id,
+        db=db,
+        start_date=date(2024, 1, 10),
+        end_date=date(2024, 4, 25),
+    )
+    assert service._view_months() == (date(2024, 2, 1), date(2024, 4, 1))
+    live_totals = service._get_school_totals()
+    assert live_totals[2:] == (Decimal("1000.00"), Decimal("150.00"), Decimal("850.00"))
+
+    school_monthly_statement.create(bind=db.get_bind())
+    try:
+        db.execute(_POPULATE_MONTHLY_STATEMENT)
+        db.commit()
+        monkeypatch.setattr(settings, "STATEMENT_MONTHLY_VIEW_ENABLED", True)
+
+        assert service._get_school_totals() == live_totals
+
+        # The whole months really are read from the view, not from the invoices
+        db.execute(school_monthly_statement.delete())
+        db.commit()
+        residual_only = service._get_school_totals()
+        assert residual_only[2:] == (Decimal("500.00"), 0, Decimal("500.00"))
+    finally:
+        db.rollback()
+        school_monthly_statement.drop(bind=db.get_bind())
+
+
+def test_school_statement_json_cached_until_billing_write(
+    db, test_school, test_invoice, payment_factory, fake_redis
+):
+    """Test the cached school statement is invalidated by bumping the namespace"""
+    service = SchoolStatementService(
+        school_id=test_school.id,
+        db=db,
+        start_date=date(2024, 1, 1),
+        end_date=date(2024, 12, 31),
+    )
+    first = service.get_statement_json()
+    assert Decimal(json.loads(first)["summary"]["total_paid"]) == 0
+    # Served from the cache, under the current namespace version
+    assert any(key.startswith("statement:v0:") for key in fake_redis.store)
+    assert service.get_statement_json() == first
+
+    payment_factory(test_invoice, amount=Decimal("250.00"))
+
+    # Any billing write bumps the version, orphaning the cached statement
+    assert fake_redis.store["statement:version"] == b"1"
+    refreshed = json.loads(service.get_statement_json())
+    assert refreshed["summary"]["total_paid"] == "250.00"
+    assert refreshed["summary"]["total_pending"] == "750.00"
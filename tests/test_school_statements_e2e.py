@@ -1,3 +1,4 @@
+import json
 from datetime import date
 
 from tests.factories import create_invoice, create_payment, create_school, create_student
@@ -307,3 +308,39 @@ def test_school_statement_default_excludes_invoices(client):
     assert (
         data["summary"]["total_invoiced"] == "1000.00"
     )  # Summary should still be calculated
+
+
+def test_school_statement_ndjson_stream(client):
+    """Test format=ndjson streams the summary line, then one line per invoice"""
+    school = create_school(client)
+    student = create_student(client, school["id"])
+    invoice = create_invoice(client, student["id"])
+    create_payment(client, invoice["id"], amount="400.00")
+    create_invoice(client, student["id"])
+
+    response = client.get(
+        f"/api/v1/schools/{school['id']}/account-statement",
+        params={
+            "start_date": "2024-01-01",
+            "end_date": "2024-12-31",
+            "include_invoices": "true",
+            "format": "ndjson",
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 3
+    assert "invoices" not in lines[0]
+    assert lines[0]["summary"]["total_invoiced"] == "2000.00"
+    assert lines[0]["summary"]["total_paid"] == "400.00"
+    rows = {row["invoice_id"]: row for row in lines[1:]}
+    assert rows[invoice["id"]]["paid_amount"] == "400.00"
+    assert rows[invoice["id"]]["pending_amount"] == "600.00"
+
+    missing = client.get(
+        "/api/v1/schools/999/account-statement",
+        params={"start_date": "2024-01-01", "end_date": "2024-12-31", "format": "ndjson"},
+    )
+    assert missing.status_code == 404
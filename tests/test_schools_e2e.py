@@ -47,6 +47,41 @@ def test_list_schools_endpoint(client):
     assert data[1]["name"] == "School 2"
 
 
+def test_list_schools_cursor_pagination(client):
+    """Test GET /api/v1/schools/ keyset pagination via X-Next-Cursor"""
+    for i in range(3):
+        client.post(
+            "/api/v1/schools/",
+            json={
+                "name": f"School {i}",
+                "contact_email": f"school{i}@test.com",
+                "contact_phone": "+1111111111",
+            },
+        )
+
+    first_page = client.get("/api/v1/schools/?limit=2")
+    assert first_page.status_code == 200
+    assert [s["name"] for s in first_page.json()] == ["School 0", "School 1"]
+    cursor = first_page.headers["X-Next-Cursor"]
+
+    second_page = client.get(f"/api/v1/schools/?limit=2&cursor={cursor}")
+    assert second_page.status_code == 200
+    assert [s["name"] for s in second_page.json()] == ["School 2"]
+    assert "X-Next-Cursor" not in second_page.headers
+
+    invalid = client.get("/api/v1/schools/?cursor=not-a-cursor")
+    assert invalid.status_code == 400
+
+
+def test_list_schools_total_count_only_on_request(client, test_school):
+    """Test GET /api/v1/schools/ only counts when include_total is set"""
+    response = client.get("/api/v1/schools/")
+    assert "X-Total-Count" not in response.headers
+
+    response = client.get("/api/v1/schools/?include_total=true")
+    assert response.headers["X-Total-Count"] == "1"
+
+
 def test_get_school_by_id_endpoint(client):
     """Test GET /api/v1/schools/{school_id}"""
     # Create a school
@@ -69,6 +104,25 @@ def test_get_school_by_id_endpoint(client):
     assert data["name"] == "Test School"
 
 
+def test_get_school_conditional_etag(client, test_school):
+    """Test GET /api/v1/schools/{school_id} answers If-None-Match with 304"""
+    response = client.get(f"/api/v1/schools/{test_school.id}")
+    etag = response.headers["ETag"]
+    assert etag.startswith(f'W/"{test_school.id}-')
+
+    not_modified = client.get(
+        f"/api/v1/schools/{test_school.id}", headers={"If-None-Match": etag}
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == etag
+
+    stale = client.get(
+        f"/api/v1/schools/{test_school.id}", headers={"If-None-Match": 'W/"stale"'}
+    )
+    assert stale.status_code == 200
+    assert stale.headers["ETag"] == etag
+
+
 def test_get_nonexistent_school_endpoint(client):
     """Test GET /api/v1/schools/{school_id} with invalid ID"""
     response = client.get("/api/v1/schools/999")
@@ -186,3 +240,14 @@ def test_delete_nonexistent_school(client):
 
     assert response.status_code == 404
     assert response.json()["detail"] == "School not found"
+
+
+def test_update_school_is_a_single_statement(client, test_school, sql_statements):
+    """Test PUT /api/v1/schools/{school_id} answers from UPDATE ... RETURNING"""
+    url = f"/api/v1/schools/{test_school.id}"
+    sql_statements.clear()
+    response = client.put(url, json={"name": "Renamed"})
+
+    assert response.status_code == 200
+    assert response.json()["name"] == "Renamed"
+    assert [sql.split()[0] for sql in sql_statements] == ["UPDATE"]
@@ -139,7 +139,7 @@ def test_update_student(db):
     )
 
     update_data = StudentUpdate(first_name="Jane", email="jane@student.com")
-    updated_student = StudentService.update(student, update_data, db)
+    updated_student = StudentService.update_by_id(student.id, update_data, db)
 
     assert updated_student.first_name == "Jane"
     assert updated_student.email == "jane@student.com"
@@ -170,7 +170,7 @@ def test_update_student_status(db):
     )
 
     update_data = StudentUpdate(status=StudentStatus.GRADUATED)
-    updated_student = StudentService.update(student, update_data, db)
+    updated_student = StudentService.update_by_id(student.id, update_data, db)
 
     assert updated_student.status == StudentStatus.GRADUATED
 
@@ -197,7 +197,7 @@ def test_soft_delete_student(db):
         db,
     )
 
-    StudentService.delete(student, db)
+    StudentService.delete_by_id(student.id, db)
 
     # Should not be returned by get_by_id
     retrieved_student = StudentService.get_by_id(student.id, db)
@@ -246,9 +246,21 @@ def test_get_all_excludes_soft_deleted(db):
     )
 
     # Soft delete student2
-    StudentService.delete(student2, db)
+    StudentService.delete_by_id(student2.id, db)
 
     # get_all should only return student1
     students = StudentService.get_all(db)
     assert len(students) == 1
     assert students[0].id == student1.id
+
+
+def test_get_read_by_id_cached_until_write(db, test_student, fake_redis):
+    """Test the cached student read is served until a service write invalidates it"""
+    assert StudentService.get_read_by_id(test_student.id, db).first_name == "John"
+    assert f"student:{test_student.id}" in fake_redis.store
+
+    StudentService.update_by_id(test_student.id, StudentUpdate(first_name="Jane"), db)
+    assert StudentService.get_read_by_id(test_student.id, db).first_name == "Jane"
+
+    StudentService.delete_by_id(test_student.id, db)
+    assert StudentService.get_read_by_id(test_student.id, db) is None
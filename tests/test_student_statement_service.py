@@ -1,3 +1,4 @@
+import json
 from datetime import date
 from decimal import Decimal
 
@@ -91,7 +92,7 @@ def test_student_statement_excludes_cancelled_invoices(db, test_student, invoice
     )
 
     # Cancel the first invoice
-    InvoiceService.cancel(invoice1, db)
+    InvoiceService.cancel_by_id(invoice1.id, db)
 
     service = StudentStatementService(
         student_id=test_student.id,
@@ -117,3 +118,24 @@ def test_student_statement_nonexistent_student(db):
     statement = service.get_statement()
 
     assert statement is None
+
+
+def test_student_statement_json_cached_until_billing_write(
+    db, test_student, test_invoice, payment_factory, fake_redis
+):
+    """Test the cached student statement is invalidated by bumping the namespace"""
+    service = StudentStatementService(
+        student_id=test_student.id,
+        db=db,
+        start_date=date(2024, 1, 1),
+        end_date=date(2024, 12, 31),
+    )
+    first = service.get_statement_json()
+    assert Decimal(json.loads(first)["summary"]["total_paid"]) == 0
+    payment_factory(test_invoice, amount=Decimal("250.00"))
+
+    # Any billing write bumps the version, orphaning the cached statement
+    assert fake_redis.store["statement:version"] == b"1"
+    refreshed = json.loads(service.get_statement_json())
+    assert refreshed["summary"]["total_paid"] == "250.00"
+    assert refreshed["summary"]["total_pending"] == "750.00"
@@ -111,6 +111,40 @@ def test_student_statement_excludes_cancelled_endpoint(client):
     assert len(data["invoices"]) == 1
 
 
+def test_student_statements_batch_endpoint(client):
+    """Test POST /api/v1/students/account-statements"""
+    school = create_school(client)
+    paying = create_student(client, school["id"])
+    idle = create_student(
+        client, school["id"], first_name="Jane", email="jane@student.com"
+    )
+    invoice = create_invoice(client, paying["id"])
+    create_payment(client, invoice["id"], amount="250.00")
+    create_invoice(client, paying["id"], issue_date=date(2025, 1, 10))
+
+    response = client.post(
+        "/api/v1/students/account-statements",
+        json={
+            "student_ids": [idle["id"], paying["id"], 999],
+            "start_date": "2024-01-01",
+            "end_date": "2024-12-31",
+        },
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [s["student_id"] for s in data] == [paying["id"], idle["id"]]
+    assert data[0]["student_name"] == "John Doe"
+    assert data[0]["school_name"] == "Test School"
+    assert data[0]["summary"] == {
+        "total_invoiced": "1000.00",
+        "total_paid": "250.00",
+        "total_pending": "750.00",
+    }
+    assert data[1]["summary"]["total_invoiced"] == "0.00"
+    assert "invoices" not in data[0]
+
+
 def test_student_statement_nonexistent_endpoint(client):
     """Test student statement for non-existent student"""
     response = client.get(
@@ -1,3 +1,6 @@
+from datetime import datetime
+
+
 def test_create_student_endpoint(client):
     """Test POST /api/v1/students/"""
     # Create a school first
@@ -114,6 +117,28 @@ def test_get_student_by_id_endpoint(client):
     assert data["first_name"] == "John"
 
 
+def test_get_student_conditional_etag(client, db, test_student):
+    """Test GET /api/v1/students/{student_id} answers If-None-Match with 304"""
+    # SQLite timestamps have one-second resolution: backdate so the update below
+    # necessarily moves updated_at
+    test_student.updated_at = datetime(2024, 1, 1, 12, 0, 0)
+    db.commit()
+    url = f"/api/v1/students/{test_student.id}"
+
+    etag = client.get(url).headers["ETag"]
+    assert etag == f'W/"{test_student.id}-20240101120000000000"'
+    not_modified = client.get(url, headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == etag
+
+    client.put(url, json={"first_name": "Jane"})
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["first_name"] == "Jane"
+    assert response.headers["ETag"] != etag
+
+
 def test_get_nonexistent_student_endpoint(client):
     """Test GET /api/v1/students/{student_id} with invalid ID"""
     response = client.get("/api/v1/students/999")
@@ -308,3 +333,14 @@ def test_delete_nonexistent_student(client):
 
     assert response.status_code == 404
     assert response.json()["detail"] == "Student not found"
+
+
+def test_update_student_is_a_single_statement(client, test_student, sql_statements):
+    """Test PUT /api/v1/students/{student_id} answers from UPDATE ... RETURNING"""
+    url = f"/api/v1/students/{test_student.id}"
+    sql_statements.clear()
+    response = client.put(url, json={"first_name": "Jane"})
+
+    assert response.status_code == 200
+    assert response.json()["first_name"] == "Jane"
+    assert [sql.split()[0] for sql in sql_statements] == ["UPDATE"]